@@ -4,17 +4,37 @@ AXM Agent - A simple, elegant Python framework for building AI agents
 
 __version__ = "0.2.3"
 
-from axm.core.agent import Agent
-from axm.core.decorators import tool, agent_method
-from axm.core.planning_agent import PlanningAgent
-from axm.core.multi_agent import MultiAgent
-from axm.llm.base import LLMProvider
-from axm.memory.conversation import ConversationMemory
-from axm.mcp.server import MCPServer
-from axm.tools.base import Tool
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from axm.core.agent import Agent, register_provider
+    from axm.core.decorators import agent_method, tool
+    from axm.core.multi_agent import MultiAgent
+    from axm.core.planning_agent import PlanningAgent
+    from axm.llm.base import LLMProvider
+    from axm.mcp.server import MCPServer
+    from axm.memory.conversation import ConversationMemory
+    from axm.tools.base import Tool
+
+# Public names and the modules defining them; each module is imported on first access
+# so that "import axm" stays cheap
+_LAZY = {
+    "Agent": "axm.core.agent",
+    "register_provider": "axm.core.agent",
+    "tool": "axm.core.decorators",
+    "agent_method": "axm.core.decorators",
+    "PlanningAgent": "axm.core.planning_agent",
+    "MultiAgent": "axm.core.multi_agent",
+    "LLMProvider": "axm.llm.base",
+    "ConversationMemory": "axm.memory.conversation",
+    "MCPServer": "axm.mcp.server",
+    "Tool": "axm.tools.base",
+}
 
 __all__ = [
     "Agent",
+    "register_provider",
     "tool",
     "agent_method",
     "PlanningAgent",
@@ -24,3 +44,18 @@ __all__ = [
     "MCPServer",
     "Tool",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names lazily on first access"""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List module attributes including the lazily imported names"""
+    return sorted(set(globals()) | set(__all__))
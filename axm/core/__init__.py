@@ -1,13 +1,31 @@
 """Core module"""
 
-from axm.core.agent import Agent
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 from axm.core.decorators import agent_method, retry, tool, validate_output
-from axm.core.multi_agent import MultiAgent
-from axm.core.planning_agent import PlanningAgent
 from axm.core.types import AgentConfig, Message, Plan, Task, ToolCall, ToolResult
 
+if TYPE_CHECKING:
+    from axm.core.agent import Agent, register_provider
+    from axm.core.batch import BatchProcessor
+    from axm.core.multi_agent import MultiAgent
+    from axm.core.planning_agent import PlanningAgent
+
+# The agent modules import axm.llm, which imports axm.core.types; loading them on
+# first access keeps "import axm.llm" from re-entering a half-initialized axm.llm.base
+_LAZY = {
+    "Agent": "axm.core.agent",
+    "register_provider": "axm.core.agent",
+    "BatchProcessor": "axm.core.batch",
+    "MultiAgent": "axm.core.multi_agent",
+    "PlanningAgent": "axm.core.planning_agent",
+}
+
 __all__ = [
     "Agent",
+    "register_provider",
+    "BatchProcessor",
     "tool",
     "agent_method",
     "validate_output",
@@ -21,3 +39,18 @@ __all__ = [
     "ToolCall",
     "ToolResult",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the agent classes lazily on first access"""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List module attributes including the lazily imported names"""
+    return sorted(set(globals()) | set(__all__))
@@ -1,15 +1,93 @@
 """Core Agent implementation"""
 
+import asyncio
+import importlib
 import json
-from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Type, Union
+import re
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 from pydantic import BaseModel
 
+from axm.core.batch import BatchProcessor
 from axm.core.types import AgentConfig, Message
 from axm.core.decorators import tool as tool_decorator
 from axm.llm.base import LLMProvider
+from axm.llm.cache import LLMCache, SemanticBackend
 from axm.memory.conversation import ConversationMemory
 from axm.tools.base import FunctionTool, Tool
+from axm.utils.serialization import loads
+
+_TOOL_CACHE_INSTRUCTION = (
+    "Tool results can be reused through cache_read and cache_write. Before calling any "
+    "data tool, first call cache_read(key) with a key naming the tool and its arguments "
+    '(for example "get_user_info:1"). On a miss, call the tool, then '
+    "cache_write(key, result) so later steps can reuse it."
+)
+
+
+# Model-name prefixes and the provider class ("module:Class") used for them, checked in
+# order; the provider modules are only imported once a model needs them
+_PROVIDER_BY_PREFIX: List[Tuple[str, str]] = [
+    ("gpt", "axm.llm.openai:OpenAIProvider"),
+    ("o1", "axm.llm.openai:OpenAIProvider"),
+    ("claude", "axm.llm.anthropic:AnthropicProvider"),
+]
+# Used when no prefix matches (uses requests library)
+_DEFAULT_PROVIDER = "axm.llm.openai_compatible:OpenAICompatibleProvider"
+
+
+def register_provider(prefix: str, target: str) -> None:
+    """
+    Use a provider class for model names starting with prefix.
+
+    Registered prefixes are checked before the built-in ones, the latest first. The
+    class is called with api_key and base_url keyword arguments.
+
+    Args:
+        prefix: Model name prefix, e.g. "mistral"
+        target: Import path of the provider class, "package.module:Class" or
+            "package.module.Class"
+    """
+    _PROVIDER_BY_PREFIX.insert(0, (prefix, target))
+
+
+def _provider_class_for(model: str) -> Callable[..., LLMProvider]:
+    """Get the provider class for a model name; it takes api_key and base_url"""
+    target = next(
+        (target for prefix, target in _PROVIDER_BY_PREFIX if model.startswith(prefix)),
+        _DEFAULT_PROVIDER,
+    )
+    module_name, _, class_name = target.rpartition(":" if ":" in target else ".")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+@lru_cache(maxsize=128)
+def _system_prompt_for(
+    system_prompt: Optional[str], role: Optional[str], tool_sig: Tuple[str, ...]
+) -> Optional[str]:
+    """Build an agent's system prompt, shared by every agent with the same settings"""
+    content = system_prompt
+    if not content and role:
+        content = f"You are a {role}. Respond accordingly."
+    if "cache_read" in tool_sig:
+        content = f"{content}\n\n{_TOOL_CACHE_INSTRUCTION}" if content else _TOOL_CACHE_INSTRUCTION
+    return content
+
+
+# Markdown code fence around a JSON answer (```json ... ```)
+_FENCE_RE = re.compile(r"\A```[A-Za-z]*[ \t]*\n?|\n?```\Z")
 
 
 class Agent:
@@ -39,6 +117,12 @@ class Agent:
         mcp_server: Optional[Any] = None,
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
+        cache: Optional[LLMCache] = None,
+        semantic_cache: bool = False,
+        sim_threshold: float = 0.92,
+        cache_ttl: Optional[float] = 3600,
+        tool_cache: bool = False,
+        trusted_structured_output: bool = False,
     ):
         """
         Initialize an Agent.
@@ -55,6 +139,15 @@ class Agent:
             mcp_server: MCP server for tool integration
             api_key: API key for the LLM provider
             base_url: Base URL for the LLM provider API
+            cache: Response cache; LLM calls at temperature 0 are served from it
+            semantic_cache: Also answer prompts similar to a cached one (creates a
+                cache if none is given; needs sentence-transformers by default)
+            sim_threshold: Minimum cosine similarity for a semantic cache hit
+            cache_ttl: Seconds entries stay valid in a cache created by semantic_cache
+            tool_cache: Give the LLM cache_read/cache_write tools to reuse tool results
+            trusted_structured_output: Build response_format models without validation,
+                for providers that guarantee schema-conforming JSON (no type coercion,
+                nested models stay dicts)
         """
         self.config = AgentConfig(
             model=model if isinstance(model, str) else "custom",
@@ -71,33 +164,30 @@ class Agent:
             self.llm = model
         elif isinstance(model, str):
             # Auto-detect provider based on model name
-            if model.startswith("gpt") or model.startswith("o1"):
-                from axm.llm.openai import OpenAIProvider
-
-                self.llm = OpenAIProvider(api_key=api_key, base_url=base_url)
-            elif model.startswith("claude"):
-                from axm.llm.anthropic import AnthropicProvider
-
-                self.llm = AnthropicProvider(api_key=api_key, base_url=base_url)
-            else:
-                # Default to OpenAI-compatible provider (uses requests library)
-                from axm.llm.openai_compatible import OpenAICompatibleProvider
-
-                self.llm = OpenAICompatibleProvider(api_key=api_key, base_url=base_url)
+            self.llm = _provider_class_for(model)(api_key=api_key, base_url=base_url)
         else:
             raise ValueError("model must be a string or LLMProvider instance")
 
         self.memory = memory or ConversationMemory()
         self.tools: Dict[str, Tool] = {}
         self.mcp_server = mcp_server
+        self.cache = cache
+        if semantic_cache:
+            if self.cache is None:
+                self.cache = LLMCache(ttl=cache_ttl)
+            if self.cache.semantic is None:
+                self.cache.semantic = SemanticBackend(threshold=sim_threshold, ttl=cache_ttl)
+
+        self._tool_cache: Dict[str, Any] = {}
+        self.trusted_structured_output = trusted_structured_output
+
+        if tool_cache:
+            self._register_cache_tools()
 
         # Add system prompt if provided
-        if system_prompt:
-            self.memory.add_message(Message(role="system", content=system_prompt))
-        elif role:
-            self.memory.add_message(
-                Message(role="system", content=f"You are a {role}. Respond accordingly.")
-            )
+        system_content = _system_prompt_for(system_prompt, role, tuple(sorted(self.tools)))
+        if system_content:
+            self.memory.add_message(Message(role="system", content=system_content))
 
         # Load tools from MCP server if provided
         if mcp_server:
@@ -109,6 +199,21 @@ class Agent:
             for tool in self.mcp_server.get_tools():
                 self.tools[tool.name] = tool
 
+    def _register_cache_tools(self) -> None:
+        """Register the cache_read/cache_write tools backed by this agent's tool cache"""
+
+        def cache_read(key: str) -> str:
+            """Look up a previously cached tool result; returns MISS if not cached"""
+            return self._tool_cache.get(key, "MISS")
+
+        def cache_write(key: str, value: str) -> str:
+            """Cache a tool result under key for later cache_read calls"""
+            self._tool_cache[key] = value
+            return "OK"
+
+        self.tool(cache_read)
+        self.tool(cache_write)
+
     def tool(
         self,
         func: Optional[Callable] = None,
@@ -168,6 +273,160 @@ class Agent:
         else:
             raise ValueError("Tool must be a Tool instance or callable")
 
+    def _cache_keys(
+        self,
+        tools_list: Optional[List[Dict[str, Any]]],
+        response_format: Optional[Type[BaseModel]],
+    ) -> Tuple[Optional[str], Optional[Tuple[str, str]]]:
+        """Get the exact and semantic cache keys for the next LLM call (None to skip)"""
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(
+            self.config.model,
+            self.memory.messages,
+            self.config.temperature,
+            max_tokens=self.config.max_tokens,
+            tools=tools_list,
+            response_format=response_format,
+            provider=self.llm,
+        )
+        semantic_key = self.cache.make_semantic_key(
+            self.config.model,
+            self.memory.messages,
+            max_tokens=self.config.max_tokens,
+            tools=tools_list,
+            response_format=response_format,
+            provider=self.llm,
+        )
+        return key, semantic_key
+
+    def _cache_get(
+        self, key: Optional[str], semantic_key: Optional[Tuple[str, str]]
+    ) -> Optional[Message]:
+        """Look up a response, trying an exact match before a similar prompt"""
+        if self.cache is None:
+            return None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        if semantic_key is not None:
+            return self.cache.get_similar(*semantic_key)
+        return None
+
+    def _cache_set(
+        self, key: Optional[str], semantic_key: Optional[Tuple[str, str]], response: Message
+    ) -> None:
+        """Store a fresh response under its cache keys"""
+        if self.cache is None:
+            return
+        if key is not None:
+            self.cache.set(key, response)
+        if semantic_key is not None:
+            self.cache.set_similar(*semantic_key, response)
+
+    async def _acache_get(
+        self, key: Optional[str], semantic_key: Optional[Tuple[str, str]]
+    ) -> Optional[Message]:
+        """Async version of _cache_get(); prompts are embedded in a worker thread"""
+        if self.cache is None:
+            return None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        if semantic_key is not None:
+            return await asyncio.to_thread(self.cache.get_similar, *semantic_key)
+        return None
+
+    async def _acache_set(
+        self, key: Optional[str], semantic_key: Optional[Tuple[str, str]], response: Message
+    ) -> None:
+        """Async version of _cache_set(); prompts are embedded in a worker thread"""
+        if self.cache is None:
+            return
+        if key is not None:
+            self.cache.set(key, response)
+        if semantic_key is not None:
+            await asyncio.to_thread(self.cache.set_similar, *semantic_key, response)
+
+    def _generate(
+        self,
+        tools_list: Optional[List[Dict[str, Any]]],
+        response_format: Optional[Type[BaseModel]],
+    ) -> Message:
+        """Call the LLM on the current memory, using the response cache if configured"""
+        key, semantic_key = self._cache_keys(tools_list, response_format)
+        cached = self._cache_get(key, semantic_key)
+        if cached is not None:
+            return cached
+
+        response = self.llm.generate(
+            messages=self.memory.messages,
+            temperature=self.config.temperature,
+            max_tokens=self.config.max_tokens,
+            tools=tools_list,
+            response_format=response_format,
+            model=self.config.model,
+            timeout=self.config.timeout,
+        )
+
+        self._cache_set(key, semantic_key, response)
+        return response
+
+    async def _agenerate(
+        self,
+        tools_list: Optional[List[Dict[str, Any]]],
+        response_format: Optional[Type[BaseModel]],
+    ) -> Message:
+        """Async version of _generate(); identical concurrent calls share one request"""
+        key, semantic_key = self._cache_keys(tools_list, response_format)
+        cached = await self._acache_get(key, semantic_key)
+        if cached is not None:
+            return cached
+
+        async def call() -> Message:
+            response = await self.llm.agenerate(
+                messages=self.memory.messages,
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+                tools=tools_list,
+                response_format=response_format,
+                model=self.config.model,
+                timeout=self.config.timeout,
+            )
+            await self._acache_set(key, semantic_key, response)
+            return response
+
+        if self.cache is None or key is None:
+            return await call()
+
+        pending = self.cache.get_pending(key)
+        if pending is not None:
+            shared = await asyncio.shield(pending)
+            return shared.model_copy(deep=True)
+
+        # Shielded so that cancelling this caller does not fail the others waiting on it
+        task = asyncio.ensure_future(call())
+        self.cache.add_pending(key, task)
+        return await asyncio.shield(task)
+
+    def _parse_structured_output(self, content: str, response_format: Type[BaseModel]) -> BaseModel:
+        """Parse a JSON response, optionally wrapped in a markdown fence, into response_format"""
+        text = content.strip()
+        # Raw JSON is the common case; only fenced answers need the regex
+        if not text.startswith(("{", "[")):
+            text = _FENCE_RE.sub("", text)
+        try:
+            if self.trusted_structured_output:
+                data = loads(text)
+                if not isinstance(data, dict):
+                    raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+                return response_format.model_construct(**data)
+            return response_format.model_validate_json(text)
+        except ValueError as e:
+            raise ValueError(f"Failed to parse response as {response_format.__name__}: {e}")
+
     def run(
         self,
         prompt: str,
@@ -197,16 +456,8 @@ class Agent:
             if self.tools:
                 tools_list = [tool.to_dict() for tool in self.tools.values()]
 
-            # Generate response
-            response = self.llm.generate(
-                messages=self.memory.messages,
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens,
-                tools=tools_list,
-                response_format=response_format,
-                model=self.config.model,
-                timeout=self.config.timeout,
-            )
+            # Generate response (served from the cache when possible)
+            response = self._generate(tools_list, response_format)
 
             # Add assistant response to memory
             self.memory.add_message(response)
@@ -249,13 +500,7 @@ class Agent:
                 # No tool calls, we have the final response
                 if response_format:
                     # Parse JSON response into Pydantic model
-                    try:
-                        json_data = json.loads(response.content)
-                        return response_format(**json_data)
-                    except (json.JSONDecodeError, ValueError) as e:
-                        raise ValueError(
-                            f"Failed to parse response as {response_format.__name__}: {e}"
-                        )
+                    return self._parse_structured_output(response.content, response_format)
                 else:
                     return response.content
 
@@ -278,15 +523,7 @@ class Agent:
             if self.tools:
                 tools_list = [tool.to_dict() for tool in self.tools.values()]
 
-            response = await self.llm.agenerate(
-                messages=self.memory.messages,
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens,
-                tools=tools_list,
-                response_format=response_format,
-                model=self.config.model,
-                timeout=self.config.timeout,
-            )
+            response = await self._agenerate(tools_list, response_format)
 
             self.memory.add_message(response)
 
@@ -322,18 +559,98 @@ class Agent:
                 continue
             else:
                 if response_format:
-                    try:
-                        json_data = json.loads(response.content)
-                        return response_format(**json_data)
-                    except (json.JSONDecodeError, ValueError) as e:
-                        raise ValueError(
-                            f"Failed to parse response as {response_format.__name__}: {e}"
-                        )
+                    return self._parse_structured_output(response.content, response_format)
                 else:
                     return response.content
 
         raise RuntimeError(f"Max iterations ({max_iterations}) reached without completion")
 
+    def run_batch(
+        self,
+        prompts: List[str],
+        response_format: Optional[Type[BaseModel]] = None,
+        max_concurrency: int = 10,
+        rate_limit_rpm: Optional[float] = 100,
+        use_batch_api: bool = False,
+    ) -> List[Union[str, BaseModel]]:
+        """
+        Answer many independent prompts in one go.
+
+        Each prompt is sent on its own with the agent's system prompt, without the
+        rest of the conversation and without tools; memory is left untouched.
+
+        Args:
+            prompts: User prompts
+            response_format: Optional Pydantic model for structured output
+            max_concurrency: Maximum requests in flight at once
+            rate_limit_rpm: Maximum requests started per minute (None for no limit)
+            use_batch_api: Submit through the OpenAI Batch API (requires OpenAIProvider)
+
+        Returns:
+            Response strings or Pydantic model instances, in prompt order
+        """
+        processor = BatchProcessor(
+            self.llm,
+            max_concurrency=max_concurrency,
+            rate_limit_rpm=rate_limit_rpm,
+            use_batch_api=use_batch_api,
+        )
+        responses = processor.process(
+            self._batch_requests(prompts), **self._batch_kwargs(response_format)
+        )
+        return self._batch_results(responses, response_format)
+
+    async def arun_batch(
+        self,
+        prompts: List[str],
+        response_format: Optional[Type[BaseModel]] = None,
+        max_concurrency: int = 10,
+        rate_limit_rpm: Optional[float] = 100,
+        use_batch_api: bool = False,
+    ) -> List[Union[str, BaseModel]]:
+        """Async version of run_batch()"""
+        processor = BatchProcessor(
+            self.llm,
+            max_concurrency=max_concurrency,
+            rate_limit_rpm=rate_limit_rpm,
+            use_batch_api=use_batch_api,
+        )
+        responses = await processor.aprocess(
+            self._batch_requests(prompts), **self._batch_kwargs(response_format)
+        )
+        return self._batch_results(responses, response_format)
+
+    def _batch_requests(self, prompts: List[str]) -> List[List[Message]]:
+        """Build one message list per prompt: the system messages, then the prompt"""
+        system_messages = [msg for msg in self.memory.messages if msg.role == "system"]
+        return [system_messages + [Message(role="user", content=prompt)] for prompt in prompts]
+
+    def _batch_kwargs(self, response_format: Optional[Type[BaseModel]]) -> Dict[str, Any]:
+        """Get the generation arguments for batch requests"""
+        return {
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "response_format": response_format,
+            "model": self.config.model,
+            "timeout": self.config.timeout,
+        }
+
+    def _batch_results(
+        self,
+        responses: List[Union[Message, BaseException]],
+        response_format: Optional[Type[BaseModel]],
+    ) -> List[Union[str, BaseModel]]:
+        """Raise the first failure, or parse each response like run() would"""
+        results: List[Union[str, BaseModel]] = []
+        for response in responses:
+            if isinstance(response, BaseException):
+                raise response
+            if response_format:
+                results.append(self._parse_structured_output(response.content, response_format))
+            else:
+                results.append(response.content)
+        return results
+
     def stream(self, prompt: str) -> Iterator[str]:
         """Stream the agent's response"""
         self.memory.add_message(Message(role="user", content=prompt))
@@ -0,0 +1,246 @@
+"""Batch processing of independent LLM requests"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Type, Union
+
+from pydantic import BaseModel
+
+from axm.core.types import Message
+from axm.llm.base import LLMProvider, _schema_for
+from axm.utils.serialization import dumps, loads
+
+_BATCH_ENDPOINT = "/v1/chat/completions"
+_BATCH_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class _TokenBucket:
+    """Requests-per-minute limiter that refills continuously"""
+
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, rate_per_minute)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token, returning 0, or the seconds to wait before trying again"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def wait(self) -> None:
+        """Block until a request may be sent"""
+        delay = self._take()
+        while delay:
+            time.sleep(delay)
+            delay = self._take()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent"""
+        delay = self._take()
+        while delay:
+            await asyncio.sleep(delay)
+            delay = self._take()
+
+
+class BatchProcessor:
+    """
+    Run many independent requests against one provider.
+
+    By default requests are sent concurrently, bounded by max_concurrency and
+    rate_limit_rpm. With use_batch_api=True they are submitted as one job to
+    the OpenAI Batch API instead, which costs less but may take hours.
+
+    Example:
+        processor = BatchProcessor(OpenAIProvider(), max_concurrency=20)
+        results = processor.process([[Message(role="user", content="Hi")]], model="gpt-4")
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        max_concurrency: int = 10,
+        rate_limit_rpm: Optional[float] = 100,
+        use_batch_api: bool = False,
+        poll_interval: float = 30.0,
+    ):
+        """
+        Initialize a batch processor.
+
+        Args:
+            provider: LLM provider to send requests with
+            max_concurrency: Maximum requests in flight at once
+            rate_limit_rpm: Maximum requests started per minute (None for no limit)
+            use_batch_api: Submit requests through the OpenAI Batch API
+            poll_interval: Seconds between Batch API status checks
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.use_batch_api = use_batch_api
+        self.poll_interval = poll_interval
+        self._limiter = _TokenBucket(rate_limit_rpm) if rate_limit_rpm else None
+
+    def process(
+        self, requests: List[List[Message]], **kwargs: Any
+    ) -> List[Union[Message, BaseException]]:
+        """
+        Generate a response for each message list.
+
+        Requests go through the provider's sync generate() on a thread pool, so
+        no event loop is created and the provider's async clients are not used.
+
+        Args:
+            requests: One message list per request
+            **kwargs: Generation arguments (model, temperature, response_format, ...)
+
+        Returns:
+            Responses in request order; a failed request's exception takes its place
+        """
+        if self.use_batch_api:
+            return self._run_batch_api(requests, **kwargs)
+
+        def run_one(messages: List[Message]) -> Message:
+            if self._limiter is not None:
+                self._limiter.wait()
+            return self.provider.generate(messages, **kwargs)
+
+        workers = max(1, min(self.max_concurrency, len(requests)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_one, messages) for messages in requests]
+        return [future.exception() or future.result() for future in futures]
+
+    async def aprocess(
+        self, requests: List[List[Message]], **kwargs: Any
+    ) -> List[Union[Message, BaseException]]:
+        """Async version of process(); requests run concurrently on the running loop"""
+        if self.use_batch_api:
+            return await self._arun_batch_api(requests, **kwargs)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_one(messages: List[Message]) -> Message:
+            async with semaphore:
+                if self._limiter is not None:
+                    await self._limiter.acquire()
+                return await self.provider.agenerate(messages, **kwargs)
+
+        return await asyncio.gather(*(run_one(m) for m in requests), return_exceptions=True)
+
+    def _batch_line(
+        self,
+        custom_id: str,
+        messages: List[Message],
+        model: str = "gpt-4",
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Type[BaseModel]] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Build one JSONL line of a Batch API input file"""
+        chat_messages = [{"role": msg.role, "content": msg.content} for msg in messages]
+        body: Dict[str, Any] = {
+            "model": model,
+            "messages": chat_messages,
+            "temperature": temperature,
+        }
+        if max_tokens:
+            body["max_tokens"] = max_tokens
+        if response_format:
+            body["response_format"] = {"type": "json_object"}
+            if chat_messages:
+                schema = _schema_for(response_format)
+                chat_messages[-1][
+                    "content"
+                ] += f"\n\nReturn a JSON object matching this schema: {schema}"
+        return {"custom_id": custom_id, "method": "POST", "url": _BATCH_ENDPOINT, "body": body}
+
+    def _batch_client(self, attr: str) -> Any:
+        """Get the provider's OpenAI client that has the Batch API"""
+        client = getattr(self.provider, attr, None)
+        if client is None or not hasattr(client, "batches"):
+            raise ValueError("use_batch_api requires an OpenAIProvider")
+        return client
+
+    def _batch_input(self, requests: List[List[Message]], kwargs: Dict[str, Any]) -> bytes:
+        """Build the JSONL input file for a Batch API job"""
+        kwargs.pop("tools", None)
+        kwargs.pop("timeout", None)
+        return b"\n".join(
+            dumps(self._batch_line(f"request-{i}", messages, **kwargs))
+            for i, messages in enumerate(requests)
+        )
+
+    def _batch_results(
+        self, batch: Any, output: Optional[str], count: int
+    ) -> List[Union[Message, BaseException]]:
+        """Map a finished Batch API job's output lines back to request order"""
+        results: List[Union[Message, BaseException]] = [
+            RuntimeError(f"No result for request {i} in batch {batch.id}") for i in range(count)
+        ]
+        for line in (output or "").splitlines():
+            if not line.strip():
+                continue
+            record = loads(line)
+            index = int(record["custom_id"].rsplit("-", 1)[1])
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                results[index] = RuntimeError(
+                    f"Batch request {index} failed: {record.get('error') or response}"
+                )
+                continue
+            message = response["body"]["choices"][0]["message"]
+            results[index] = Message(role="assistant", content=message.get("content") or "")
+        return results
+
+    def _run_batch_api(
+        self, requests: List[List[Message]], **kwargs: Any
+    ) -> List[Union[Message, BaseException]]:
+        """Submit requests as one Batch API job and wait for its results"""
+        client = self._batch_client("client")
+        input_file = client.files.create(
+            file=("batch.jsonl", self._batch_input(requests, kwargs)), purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=input_file.id, endpoint=_BATCH_ENDPOINT, completion_window="24h"
+        )
+        while batch.status not in _BATCH_FINAL_STATUSES:
+            time.sleep(self.poll_interval)
+            batch = client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+        output = client.files.content(batch.output_file_id).text if batch.output_file_id else None
+        return self._batch_results(batch, output, len(requests))
+
+    async def _arun_batch_api(
+        self, requests: List[List[Message]], **kwargs: Any
+    ) -> List[Union[Message, BaseException]]:
+        """Async version of _run_batch_api()"""
+        client = self._batch_client("async_client")
+        input_file = await client.files.create(
+            file=("batch.jsonl", self._batch_input(requests, kwargs)), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id, endpoint=_BATCH_ENDPOINT, completion_window="24h"
+        )
+        while batch.status not in _BATCH_FINAL_STATUSES:
+            await asyncio.sleep(self.poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+        output = None
+        if batch.output_file_id:
+            output = (await client.files.content(batch.output_file_id)).text
+        return self._batch_results(batch, output, len(requests))
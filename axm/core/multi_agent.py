@@ -1,8 +1,17 @@
 """Multi-Agent system for collaboration"""
 
-from typing import Dict, List, Optional
+import asyncio
+import copy
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pydantic import BaseModel
 
 from axm.core.agent import Agent
+from axm.core.types import Message
+from axm.llm.base import LLMProvider
+from axm.memory.conversation import ConversationMemory
 
 
 class MultiAgent:
@@ -19,19 +28,36 @@ class MultiAgent:
     def __init__(
         self,
         agents: List[Agent],
-        orchestrator_model: str = "gpt-4",
+        orchestrator_model: Union[str, LLMProvider] = "gpt-4",
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
+        endpoints: Optional[List[Dict[str, Any]]] = None,
     ):
         """
         Initialize a multi-agent system.
 
         Args:
             agents: List of agents to collaborate
-            orchestrator_model: Model for the orchestrator
-            api_key: API key for the orchestrator agent
-            base_url: Base URL for the orchestrator agent
+            orchestrator_model: Model name or LLMProvider instance for the orchestrator
+            api_key: API key for the orchestrator agent (default: endpoints[0])
+            base_url: Base URL for the orchestrator agent (default: endpoints[0])
+            endpoints: OpenAICompatibleProvider arguments (base_url, api_key, ...) per
+                endpoint. Agents created from a model name are spread over them in
+                turn, so the team is not limited by one endpoint's rate limits
         """
+        self._endpoint_providers: Optional[Iterator[LLMProvider]] = None
+        if endpoints:
+            from axm.llm.openai_compatible import OpenAICompatibleProvider
+
+            # One provider per endpoint, shared by all agents assigned to it
+            self._endpoint_providers = itertools.cycle(
+                [OpenAICompatibleProvider(**endpoint) for endpoint in endpoints]
+            )
+            for agent in agents:
+                self._assign_endpoint(agent)
+            api_key = api_key or endpoints[0].get("api_key")
+            base_url = base_url or endpoints[0].get("base_url")
+
         self.agents = {agent.config.role or f"agent_{i}": agent for i, agent in enumerate(agents)}
         self.orchestrator = Agent(
             orchestrator_model,
@@ -40,6 +66,12 @@ class MultiAgent:
             base_url=base_url,
         )
 
+    def _assign_endpoint(self, agent: Agent) -> None:
+        """Point an agent at the next endpoint, if endpoints were given"""
+        # Agents wrapping a provider instance have no model name to send elsewhere
+        if self._endpoint_providers is not None and agent.config.model != "custom":
+            agent.llm = next(self._endpoint_providers)
+
     def _create_orchestrator_prompt(self) -> str:
         """Create system prompt for orchestrator"""
         roles = ", ".join(self.agents.keys())
@@ -53,7 +85,9 @@ Your job is to:
 
 For each subtask, specify which agent should handle it and what they should do."""
 
-    def collaborate(self, task: str, max_rounds: int = 3, verbose: bool = True) -> str:
+    def collaborate(
+        self, task: str, max_rounds: int = 3, verbose: bool = True, parallel: bool = True
+    ) -> str:
         """
         Have agents collaborate on a task.
 
@@ -61,6 +95,8 @@ For each subtask, specify which agent should handle it and what they should do."
             task: The task to accomplish
             max_rounds: Maximum collaboration rounds
             verbose: Whether to print progress
+            parallel: Run the agents assigned in the same round concurrently, each
+                on its own thread
 
         Returns:
             Final collaborative result
@@ -68,66 +104,147 @@ For each subtask, specify which agent should handle it and what they should do."
         if verbose:
             print(f"🤝 Starting collaboration on: {task}\n")
 
+        orchestrator = self._orchestrator_for_call()
         conversation_history: List[Dict[str, str]] = []
 
         for round_num in range(max_rounds):
             if verbose:
                 print(f"📍 Round {round_num + 1}/{max_rounds}")
 
-            # Orchestrator decides what to do
-            orchestrator_prompt = f"""Task: {task}
-
-Previous work:
-{self._format_history(conversation_history)}
+            orchestrator_response = str(
+                orchestrator.run(self._next_step_prompt(task, conversation_history))
+            )
+            final_answer = self._final_answer(orchestrator_response, verbose)
+            if final_answer is not None:
+                return final_answer
 
-What should we do next? Assign work to agents or provide final answer.
-If providing final answer, start with "FINAL:".
-Otherwise, format as: ASSIGN <agent_role>: <instruction>"""
+            assignments = self._assignments_for(orchestrator_response, verbose)
+            if parallel and len(assignments) > 1:
+                with ThreadPoolExecutor(max_workers=len(assignments)) as pool:
+                    results = list(pool.map(lambda a: self.agents[a[0]].run(a[1]), assignments))
+            else:
+                results = [self.agents[role].run(instruction) for role, instruction in assignments]
+            self._record_results(assignments, results, conversation_history, verbose)
 
-            orchestrator_response: str = self.orchestrator.run(orchestrator_prompt)
+        # If we exhausted rounds, ask orchestrator for final synthesis
+        if verbose:
+            print("⏱️  Max rounds reached, synthesizing final answer...\n")
 
-            if verbose:
-                print(f"🎯 Orchestrator: {orchestrator_response[:100]}...\n")
+        return str(orchestrator.run(self._final_prompt(task, conversation_history)))
 
-            # Check if we have a final answer
-            if orchestrator_response.startswith("FINAL:"):
-                final_answer = orchestrator_response[6:].strip()
-                if verbose:
-                    print("✅ Final result achieved!\n")
-                return final_answer
+    async def collaborate_async(
+        self, task: str, max_rounds: int = 3, verbose: bool = True, parallel: bool = True
+    ) -> str:
+        """
+        Async version of collaborate().
 
-            # Parse agent assignments
-            assignments = self._parse_assignments(str(orchestrator_response))
+        The orchestrator assigns at most one instruction per role each round, and
+        those assignments only see the previous rounds' results, so with parallel
+        enabled they run concurrently and a round takes as long as its slowest
+        agent rather than the sum of all of them.
+        """
+        if verbose:
+            print(f"🤝 Starting collaboration on: {task}\n")
 
-            # Execute assignments
-            for agent_role, instruction in assignments.items():
-                if agent_role in self.agents:
-                    if verbose:
-                        print(f"  👤 {agent_role}: {instruction[:80]}...")
+        orchestrator = self._orchestrator_for_call()
+        conversation_history: List[Dict[str, str]] = []
 
-                    agent = self.agents[agent_role]
-                    result = agent.run(instruction)
+        for round_num in range(max_rounds):
+            if verbose:
+                print(f"📍 Round {round_num + 1}/{max_rounds}")
 
-                    conversation_history.append(
-                        {"role": agent_role, "instruction": instruction, "result": result}
-                    )
+            orchestrator_response = str(
+                await orchestrator.arun(self._next_step_prompt(task, conversation_history))
+            )
+            final_answer = self._final_answer(orchestrator_response, verbose)
+            if final_answer is not None:
+                return final_answer
 
-                    if verbose:
-                        print(f"     ✓ {result[:80]}...\n")
+            assignments = self._assignments_for(orchestrator_response, verbose)
+            if parallel:
+                results = await asyncio.gather(
+                    *(self.agents[role].arun(instruction) for role, instruction in assignments)
+                )
+            else:
+                results = [
+                    await self.agents[role].arun(instruction) for role, instruction in assignments
+                ]
+            self._record_results(assignments, results, conversation_history, verbose)
 
         # If we exhausted rounds, ask orchestrator for final synthesis
         if verbose:
             print("⏱️  Max rounds reached, synthesizing final answer...\n")
 
-        final_prompt = f"""Task: {task}
+        return str(await orchestrator.arun(self._final_prompt(task, conversation_history)))
+
+    def _orchestrator_for_call(self) -> Agent:
+        """Get the orchestrator with a conversation of its own for one collaboration.
+
+        The copy shares the orchestrator's provider and settings, so every call
+        reuses the same client while concurrent calls keep separate histories.
+        """
+        orchestrator = copy.copy(self.orchestrator)
+        orchestrator.memory = ConversationMemory(self.orchestrator.memory.max_messages)
+        for message in self.orchestrator.memory.messages:
+            if message.role == "system":
+                orchestrator.memory.add_message(message)
+        return orchestrator
+
+    def _next_step_prompt(self, task: str, history: List[Dict[str, str]]) -> str:
+        """Ask the orchestrator for the next assignments or the final answer"""
+        return f"""Task: {task}
+
+Previous work:
+{self._format_history(history)}
+
+What should we do next? Assign work to agents or provide final answer.
+If providing final answer, start with "FINAL:".
+Otherwise, format as: ASSIGN <agent_role>: <instruction>"""
+
+    def _final_prompt(self, task: str, history: List[Dict[str, str]]) -> str:
+        """Ask the orchestrator to synthesize the work done so far"""
+        return f"""Task: {task}
 
 All work completed:
-{self._format_history(conversation_history)}
+{self._format_history(history)}
 
 Provide a comprehensive final answer synthesizing all the work."""
 
-        final_answer: str = self.orchestrator.run(final_prompt)
-        return final_answer
+    def _final_answer(self, response: str, verbose: bool) -> Optional[str]:
+        """Get the final answer from an orchestrator response, if it gave one"""
+        if verbose:
+            print(f"🎯 Orchestrator: {response[:100]}...\n")
+        if not response.startswith("FINAL:"):
+            return None
+        if verbose:
+            print("✅ Final result achieved!\n")
+        return response[6:].strip()
+
+    def _assignments_for(self, response: str, verbose: bool) -> List[Tuple[str, str]]:
+        """Get the (role, instruction) assignments for known agents from a response"""
+        assignments = [
+            (agent_role, instruction)
+            for agent_role, instruction in self._parse_assignments(str(response)).items()
+            if agent_role in self.agents
+        ]
+        if verbose:
+            for agent_role, instruction in assignments:
+                print(f"  👤 {agent_role}: {instruction[:80]}...")
+        return assignments
+
+    def _record_results(
+        self,
+        assignments: List[Tuple[str, str]],
+        results: Sequence[Union[str, BaseModel]],
+        history: List[Dict[str, str]],
+        verbose: bool,
+    ) -> None:
+        """Append a round's results to the collaboration history"""
+        for (agent_role, instruction), output in zip(assignments, results):
+            result = str(output)
+            history.append({"role": agent_role, "instruction": instruction, "result": result})
+            if verbose:
+                print(f"     ✓ {agent_role}: {result[:80]}...\n")
 
     def _parse_assignments(self, response: str) -> Dict[str, str]:
         """Parse agent assignments from orchestrator response"""
@@ -158,8 +275,17 @@ Provide a comprehensive final answer synthesizing all the work."""
     def add_agent(self, agent: Agent, role: Optional[str] = None) -> None:
         """Add an agent to the team"""
         agent_role = role or agent.config.role or f"agent_{len(self.agents)}"
+        self._assign_endpoint(agent)
         self.agents[agent_role] = agent
 
+        # Keep the orchestrator's list of roles current. Sent messages are replaced
+        # rather than edited, since providers cache their conversion by identity
+        messages = self.orchestrator.memory.messages
+        for i, message in enumerate(messages):
+            if message.role == "system":
+                messages[i] = Message(role="system", content=self._create_orchestrator_prompt())
+                break
+
     def get_agent(self, role: str) -> Optional[Agent]:
         """Get an agent by role"""
         return self.agents.get(role)
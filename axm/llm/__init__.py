@@ -1,9 +1,19 @@
 """LLM providers"""
 
 from axm.llm.base import LLMProvider
+from axm.llm.cache import CacheBackend, InMemoryBackend, LLMCache, SemanticBackend
 
 # Lazy imports for providers - only import when used
-__all__ = ["LLMProvider", "OpenAIProvider", "AnthropicProvider", "OpenAICompatibleProvider"]
+__all__ = [
+    "LLMProvider",
+    "LLMCache",
+    "CacheBackend",
+    "InMemoryBackend",
+    "SemanticBackend",
+    "OpenAIProvider",
+    "AnthropicProvider",
+    "OpenAICompatibleProvider",
+]
 
 
 def __getattr__(name):
@@ -15,7 +15,7 @@ except ImportError:
     )
 
 from axm.core.types import Message
-from axm.llm.base import LLMProvider
+from axm.llm.base import LLMProvider, _schema_for
 
 
 class AnthropicProvider(LLMProvider):
@@ -116,7 +116,7 @@ class AnthropicProvider(LLMProvider):
 
         if response_format:
             # Add instruction for JSON output
-            schema = response_format.model_json_schema()
+            schema = _schema_for(response_format)
             schema_msg = f"\n\nYou must respond with valid JSON matching this schema: {schema}"
             if system_content:
                 params["system"] += schema_msg
@@ -195,14 +195,12 @@ class AnthropicProvider(LLMProvider):
             params["tools"] = anthropic_tools
 
         if response_format:
+            schema = _schema_for(response_format)
+            schema_msg = f"\n\nYou must respond with valid JSON matching this schema: {schema}"
             if system_content:
-                params[
-                    "system"
-                ] += f"\n\nYou must respond with valid JSON matching this schema: {response_format.model_json_schema()}"
+                params["system"] += schema_msg
             else:
-                params["system"] = (
-                    f"You must respond with valid JSON matching this schema: {response_format.model_json_schema()}"
-                )
+                params["system"] = schema_msg.strip()
 
         response = await self.async_client.messages.create(**params)
 
@@ -1,13 +1,34 @@
 """Base LLM provider interface"""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Type
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Type, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, create_model
 
 from axm.core.types import Message
 
 
+@lru_cache(maxsize=256)
+def _schema_for(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Get the JSON schema of a response model, built once per class.
+
+    The returned dict is shared between callers and must not be modified.
+    """
+    return model.model_json_schema()
+
+
+@lru_cache(maxsize=64)
+def _marshal_model(item_type: Any) -> Type[BaseModel]:
+    """Get the response model wrapping a list of answers of item_type.
+
+    JSON mode only allows objects at the top level, so the answers array is
+    wrapped in an object rather than using a bare RootModel list.
+    """
+    return create_model("MarshaledAnswers", answers=(List[item_type], ...))
+
+
 class LLMProvider(ABC):
     """Base class for LLM providers"""
 
@@ -65,3 +86,84 @@ class LLMProvider(ABC):
         # async def astream(...) -> AsyncIterator[str]:
         #     yield chunk
         pass
+
+    async def abatch_generate(
+        self,
+        batches: List[List[Message]],
+        max_concurrency: int = 32,
+        **kwargs: Any,
+    ) -> List[Union[Message, BaseException]]:
+        """
+        Generate responses for several independent conversations concurrently.
+
+        Each conversation is sent through agenerate(); at most max_concurrency
+        requests are in flight at once. Results keep the order of batches, and a
+        failed request yields its exception instead of aborting the others.
+
+        Self-hosted backends usually cap parallelism server-side (for example
+        OLLAMA_NUM_PARALLEL for Ollama, or --max-num-seqs for vLLM), so raise
+        those limits to benefit from a higher max_concurrency.
+
+        Args:
+            batches: List of message lists, one per conversation
+            max_concurrency: Maximum number of concurrent requests
+            **kwargs: Extra arguments forwarded to agenerate()
+
+        Returns:
+            List of response messages or exceptions, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _one(messages: List[Message]) -> Message:
+            async with semaphore:
+                return await self.agenerate(messages, **kwargs)
+
+        return await asyncio.gather(*[_one(b) for b in batches], return_exceptions=True)
+
+    def batch_marshal_generate(
+        self,
+        prompts: List[str],
+        k: int = 8,
+        response_schema: Optional[Type[BaseModel]] = None,
+        **kwargs: Any,
+    ) -> List[Any]:
+        """
+        Answer many prompts with k-times fewer requests by packing them together.
+
+        Prompts are grouped k at a time into one numbered request that asks for a
+        JSON array of k answers. This helps when a provider's requests-per-minute
+        limit is the bottleneck: each request gets a bit slower and larger, but
+        the number of requests drops by a factor of k. Prefer abatch_generate()
+        when latency per prompt matters more than request count, and keep k small
+        enough that the answers fit in max_tokens.
+
+        Args:
+            prompts: Independent prompts to answer
+            k: Number of prompts packed into each request
+            response_schema: Optional Pydantic model for each answer (default: str)
+            **kwargs: Extra arguments forwarded to generate()
+
+        Returns:
+            One answer per prompt, in order (strings or response_schema instances)
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+
+        wrapper = _marshal_model(response_schema or str)
+        results: List[Any] = []
+        for start in range(0, len(prompts), k):
+            group = prompts[start : start + k]
+            numbered = "\n".join(f"{i}) {prompt}" for i, prompt in enumerate(group, 1))
+            request = (
+                f"Answer each of the following {len(group)} prompts independently. "
+                f'Reply with a JSON object whose "answers" array holds exactly '
+                f"{len(group)} answers, in the same order.\n\n{numbered}"
+            )
+            response = self.generate(
+                [Message(role="user", content=request)], response_format=wrapper, **kwargs
+            )
+            answers = wrapper.model_validate_json(response.content).answers  # type: ignore
+            if len(answers) != len(group):
+                raise ValueError(f"Expected {len(group)} answers, got {len(answers)}")
+            results.extend(answers)
+        return results
@@ -0,0 +1,360 @@
+"""Response caching for LLM calls"""
+
+import asyncio
+import hashlib
+import math
+import operator
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+
+from axm.core.types import Message
+from axm.llm.base import LLMProvider, _schema_for
+from axm.utils.serialization import dumps_sorted
+
+
+class CacheBackend(Protocol):
+    """Storage interface for cached LLM responses (serialized as JSON strings)"""
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a stored value, or None if missing or expired"""
+        ...
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value"""
+        ...
+
+    def clear(self) -> None:
+        """Remove all stored values"""
+        ...
+
+
+class InMemoryBackend:
+    """In-process LRU store with an optional time-to-live"""
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        """
+        Initialize the in-memory backend.
+
+        Args:
+            max_size: Maximum number of entries (least recently used are evicted)
+            ttl: Seconds an entry stays valid (None for no expiry)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a stored value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value, evicting the least recently used entries"""
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all stored values"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """Get the number of stored entries"""
+        return len(self._data)
+
+
+Embedder = Callable[[str], Sequence[float]]
+
+_DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+_default_model: Any = None
+
+
+def _default_embedder(text: str) -> Sequence[float]:
+    """Embed text with a small local sentence-transformers model (loaded on first use)"""
+    global _default_model
+    if _default_model is None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError(
+                "Semantic caching requires the sentence-transformers package. "
+                "Install it with: pip install axm-agent[semantic]"
+            )
+        _default_model = SentenceTransformer(_DEFAULT_EMBEDDING_MODEL)
+    return _default_model.encode(text).tolist()
+
+
+def _normalize(vector: Sequence[float]) -> Optional[List[float]]:
+    """Scale a vector to unit length (None for a zero vector)"""
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return None
+    return [x / norm for x in vector]
+
+
+_SemanticEntry = Tuple[float, List[float], str]
+
+
+class SemanticBackend:
+    """
+    Store that matches prompts by embedding similarity instead of exact text.
+
+    Entries are grouped by a scope key covering everything except the prompt, so a
+    cached answer is only returned for the same model, history, tools and schema.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        threshold: float = 0.92,
+        max_size: int = 1024,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Initialize the semantic backend.
+
+        Args:
+            embedder: Function mapping text to a vector (default: all-MiniLM-L6-v2)
+            threshold: Minimum cosine similarity for a cache hit
+            max_size: Maximum number of entries (least recently used are evicted)
+            ttl: Seconds an entry stays valid (None for no expiry)
+        """
+        self.embedder = embedder or _default_embedder
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        # (scope, prompt) -> (stored at, unit embedding, value)
+        self._data: "OrderedDict[Tuple[str, str], _SemanticEntry]" = OrderedDict()
+        self._last_embedding: Optional[Tuple[str, Optional[List[float]]]] = None
+        self._lock = threading.Lock()
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed text, reusing the previous result for a lookup followed by a store"""
+        with self._lock:
+            last = self._last_embedding
+        if last is not None and last[0] == text:
+            return last[1]
+        # The embedder runs outside the lock so other threads are not held up by it
+        vector = _normalize(self.embedder(text))
+        with self._lock:
+            self._last_embedding = (text, vector)
+        return vector
+
+    def get(self, scope: str, text: str) -> Optional[str]:
+        """Get the value stored for the most similar text in scope, if similar enough"""
+        vector = self._embed(text)
+        if vector is None:
+            return None
+
+        with self._lock:
+            now = time.monotonic()
+            best_key = None
+            best_score = self.threshold
+            for key, (stored_at, stored_vector, _) in list(self._data.items()):
+                if self.ttl is not None and now - stored_at > self.ttl:
+                    del self._data[key]
+                    continue
+                if key[0] != scope:
+                    continue
+                score = sum(map(operator.mul, vector, stored_vector))
+                if score >= best_score:
+                    best_key, best_score = key, score
+
+            if best_key is None:
+                return None
+            self._data.move_to_end(best_key)
+            return self._data[best_key][2]
+
+    def set(self, scope: str, text: str, value: str) -> None:
+        """Store a value for text in scope, evicting the least recently used entries"""
+        vector = self._embed(text)
+        if vector is None:
+            return
+        with self._lock:
+            self._data[(scope, text)] = (time.monotonic(), vector, value)
+            self._data.move_to_end((scope, text))
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all stored values"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """Get the number of stored entries"""
+        return len(self._data)
+
+
+def _provider_identity(provider: Optional[LLMProvider]) -> Optional[str]:
+    """Describe which endpoint a provider calls: its class plus its base_url, if any"""
+    if provider is None:
+        return None
+    cls = type(provider)
+    base_url = getattr(provider, "base_url", None)
+    if base_url is None:
+        base_url = getattr(getattr(provider, "client", None), "base_url", None)
+    return f"{cls.__module__}.{cls.__qualname__}@{base_url or ''}"
+
+
+class LLMCache:
+    """
+    Exact-match cache of LLM responses for deterministic calls.
+
+    Only calls made at temperature 0 are cached; sampled responses are expected
+    to differ between calls. With a SemanticBackend, prompts that are close to a
+    previous one are also answered from the cache, at any temperature.
+
+    Example:
+        cache = LLMCache(ttl=3600)
+        agent = Agent("gpt-4", temperature=0, cache=cache)
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        max_size: int = 1024,
+        ttl: Optional[float] = None,
+        semantic: Optional[SemanticBackend] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Storage backend (default: InMemoryBackend)
+            max_size: Maximum entries for the default backend
+            ttl: Time-to-live in seconds for the default backend
+            semantic: Optional backend for near-match lookups after an exact miss
+        """
+        self.backend: CacheBackend = backend or InMemoryBackend(max_size=max_size, ttl=ttl)
+        self.semantic = semantic
+        self._pending: Dict[str, "asyncio.Future[Message]"] = {}
+
+    @staticmethod
+    def _digest(
+        model: str,
+        messages: List[Message],
+        max_tokens: Optional[int],
+        tools: Optional[List[Dict[str, Any]]],
+        response_format: Optional[Type[BaseModel]],
+        provider: Optional[LLMProvider],
+    ) -> str:
+        """Hash the parts of a call that determine its response"""
+        payload = {
+            "provider": _provider_identity(provider),
+            "model": model,
+            "messages": [msg.model_dump() for msg in messages],
+            "max_tokens": max_tokens,
+            "tools": sorted(tools or [], key=lambda t: t.get("function", {}).get("name", "")),
+            "schema": _schema_for(response_format) if response_format else None,
+        }
+        return hashlib.sha256(dumps_sorted(payload)).hexdigest()
+
+    def make_key(
+        self,
+        model: str,
+        messages: List[Message],
+        temperature: float,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        response_format: Optional[Type[BaseModel]] = None,
+        provider: Optional[LLMProvider] = None,
+    ) -> Optional[str]:
+        """
+        Build the cache key for an LLM call.
+
+        Pass the provider making the call so agents on different providers or
+        endpoints that share this cache do not get each other's responses.
+
+        Returns:
+            A sha256 hex digest, or None if the call should not be cached
+        """
+        if temperature != 0:
+            return None
+        return self._digest(model, messages, max_tokens, tools, response_format, provider)
+
+    def make_semantic_key(
+        self,
+        model: str,
+        messages: List[Message],
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        response_format: Optional[Type[BaseModel]] = None,
+        provider: Optional[LLMProvider] = None,
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Build the semantic lookup key for an LLM call (provider as for make_key()).
+
+        Returns:
+            (scope, prompt) for a call that ends with a user prompt, or None if
+            there is no semantic backend or the call continues a tool exchange
+        """
+        if self.semantic is None or not messages or messages[-1].role != "user":
+            return None
+        scope = self._digest(model, messages[:-1], max_tokens, tools, response_format, provider)
+        return scope, messages[-1].content
+
+    def get(self, key: str) -> Optional[Message]:
+        """Get a cached response message"""
+        raw = self.backend.get(key)
+        if raw is None:
+            return None
+        return Message.model_validate_json(raw)
+
+    def set(self, key: str, message: Message) -> None:
+        """Cache a response message"""
+        self.backend.set(key, message.model_dump_json())
+
+    def get_similar(self, scope: str, prompt: str) -> Optional[Message]:
+        """Get the cached response for a prompt similar to this one"""
+        if self.semantic is None:
+            return None
+        raw = self.semantic.get(scope, prompt)
+        if raw is None:
+            return None
+        return Message.model_validate_json(raw)
+
+    def set_similar(self, scope: str, prompt: str, message: Message) -> None:
+        """Cache a response for near-match lookups (tool calls are never reused)"""
+        if self.semantic is None or message.tool_calls:
+            return
+        self.semantic.set(scope, prompt, message.model_dump_json())
+
+    def get_pending(self, key: str) -> Optional["asyncio.Future[Message]"]:
+        """Get the in-flight request for key started on the running event loop"""
+        future = self._pending.get(key)
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            return None
+        return future
+
+    def add_pending(self, key: str, future: "asyncio.Future[Message]") -> None:
+        """Track an in-flight request so concurrent identical calls can wait for it"""
+        self._pending[key] = future
+
+        def forget(_: "asyncio.Future[Message]") -> None:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+        future.add_done_callback(forget)
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        self.backend.clear()
+        if self.semantic is not None:
+            self.semantic.clear()
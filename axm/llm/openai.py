@@ -1,8 +1,11 @@
 """OpenAI LLM provider"""
 
+import importlib.util
 import os
+import threading
 from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Type
 
+import httpx
 from pydantic import BaseModel
 
 try:
@@ -14,7 +17,27 @@ except ImportError:
     )
 
 from axm.core.types import Message
-from axm.llm.base import LLMProvider
+from axm.llm.base import LLMProvider, _schema_for
+
+# HTTP/2 multiplexes concurrent requests over one connection but needs the optional h2 package
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+
+# httpx clients shared by all providers talking to the same base_url
+_CLIENT_POOL: Dict[Optional[str], httpx.Client] = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+
+
+def _pooled_client(base_url: Optional[str]) -> httpx.Client:
+    """Get the shared httpx client for base_url, creating it on first use"""
+    with _CLIENT_POOL_LOCK:
+        client = _CLIENT_POOL.get(base_url)
+        if client is None:
+            client = httpx.Client(
+                transport=httpx.HTTPTransport(http2=_HTTP2, limits=_LIMITS, retries=1)
+            )
+            _CLIENT_POOL[base_url] = client
+        return client
 
 
 class OpenAIProvider(LLMProvider):
@@ -32,8 +55,18 @@ class OpenAIProvider(LLMProvider):
             base_url: Optional base URL for API
         """
         api_key = api_key or os.environ.get("AXM_OPENAI_API_KEY")
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
-        self.async_client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        # Reuse keep-alive connections across every provider for the same endpoint
+        self.client = OpenAI(
+            api_key=api_key, base_url=base_url, http_client=_pooled_client(base_url)
+        )
+        # Async clients are bound to an event loop, so each provider gets its own
+        self.async_client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(http2=_HTTP2, limits=_LIMITS, retries=1)
+            ),
+        )
 
     def _convert_messages(self, messages: List[Message]) -> List[Dict[str, Any]]:
         """Convert internal messages to OpenAI format"""
@@ -82,7 +115,7 @@ class OpenAIProvider(LLMProvider):
             params["response_format"] = {"type": "json_object"}
             # Add instruction to return JSON
             if openai_messages:
-                schema = response_format.model_json_schema()
+                schema = _schema_for(response_format)
                 openai_messages[-1][
                     "content"
                 ] += f"\n\nReturn a JSON object matching this schema: {schema}"
@@ -140,9 +173,10 @@ class OpenAIProvider(LLMProvider):
         if response_format:
             params["response_format"] = {"type": "json_object"}
             if openai_messages:
+                schema = _schema_for(response_format)
                 openai_messages[-1][
                     "content"
-                ] += f"\n\nReturn a JSON object matching this schema: {response_format.model_json_schema()}"
+                ] += f"\n\nReturn a JSON object matching this schema: {schema}"
 
         response = await self.async_client.chat.completions.create(**params)
         choice = response.choices[0]
@@ -1,22 +1,404 @@
-"""OpenAI-compatible LLM provider using requests library"""
+"""OpenAI-compatible LLM provider using requests (sync) and httpx (async)"""
 
-import json
+import asyncio
+import hashlib
+import importlib.util
 import os
-from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Type
+import re
+import socket
+import threading
+import warnings
+from collections import OrderedDict
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Tuple,
+    Type,
+)
 
-import requests
 from pydantic import BaseModel
 
-try:
+from axm.core.types import Message
+from axm.llm.base import LLMProvider, _schema_for
+from axm.utils.serialization import JSONDecodeError
+from axm.utils.serialization import dumps as _dumps
+from axm.utils.serialization import loads as _loads
+
+if TYPE_CHECKING:
     import httpx
-except ImportError:
-    raise ImportError(
-        "OpenAI-compatible provider requires httpx for async support. "
-        "Install it with: pip install httpx"
+    import requests
+
+# requests is only needed by the sync paths and httpx by the async ones, so each
+# is imported on first use
+_requests: Any = None
+_httpx: Any = None
+_aiohttp: Any = None
+
+
+def _get_requests() -> Any:
+    """Import requests lazily so async-only callers never pay its import cost"""
+    global _requests
+    if _requests is None:
+        import requests
+
+        _requests = requests
+    return _requests
+
+
+# Disable Nagle so streamed tokens are not delayed, and keep idle pooled sockets alive
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+_adapter_class: Any = None
+
+
+def _get_adapter_class() -> Any:
+    """Get an HTTPAdapter subclass that applies _SOCKET_OPTIONS to pooled connections"""
+    global _adapter_class
+    if _adapter_class is None:
+        from requests.adapters import HTTPAdapter
+
+        class _SocketOptionsAdapter(HTTPAdapter):
+            def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+                kwargs["socket_options"] = _SOCKET_OPTIONS
+                super().init_poolmanager(*args, **kwargs)
+
+        _adapter_class = _SocketOptionsAdapter
+    return _adapter_class
+
+
+# Sessions shared by all providers talking to the same base_url
+_SESSION_POOL: Dict[str, "requests.Session"] = {}
+_SESSION_POOL_LOCK = threading.Lock()
+
+
+def _pooled_session(base_url: str) -> "requests.Session":
+    """Get the shared session for base_url, creating it on first use"""
+    session = _SESSION_POOL.get(base_url)
+    if session is not None:
+        return session
+
+    with _SESSION_POOL_LOCK:
+        session = _SESSION_POOL.get(base_url)
+        if session is None:
+            requests = _get_requests()
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            # Sized for several agents sharing an endpoint from multiple threads. Only
+            # failed connects are retried: completions are non-idempotent POSTs, so
+            # read errors and 429/5xx responses are left to the caller
+            adapter = _get_adapter_class()(
+                pool_connections=32,
+                pool_maxsize=64,
+                pool_block=False,
+                max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION_POOL[base_url] = session
+    return session
+
+
+# Endpoints that already have a warm-up request in flight or done
+_WARMED_URLS: set = set()
+
+
+def _warm_up(base_url: str, timeout: float) -> None:
+    """Open a keep-alive connection to base_url in the background, once per endpoint"""
+    with _SESSION_POOL_LOCK:
+        if base_url in _WARMED_URLS:
+            return
+        _WARMED_URLS.add(base_url)
+
+    def warm() -> None:
+        try:
+            _pooled_session(base_url).head(base_url, timeout=timeout)
+        except Exception:
+            pass  # the first real request connects (and reports errors) itself
+
+    threading.Thread(target=warm, name="axm-warmup", daemon=True).start()
+
+
+_h2_available: Optional[bool] = None
+
+
+def _http2_supported() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is installed"""
+    global _h2_available
+    if _h2_available is None:
+        _h2_available = importlib.util.find_spec("h2") is not None
+    return _h2_available
+
+
+def _get_httpx() -> Any:
+    """Import httpx lazily so sync-only callers never pay its import cost"""
+    global _httpx
+    if _httpx is None:
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "OpenAI-compatible provider requires httpx for async support. "
+                "Install it with: pip install httpx"
+            )
+        _httpx = httpx
+    return _httpx
+
+
+def _get_aiohttp() -> Any:
+    """Import aiohttp lazily; it is only used by the opt-in aiohttp transport"""
+    global _aiohttp
+    if _aiohttp is None:
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError(
+                'transport="aiohttp" requires the aiohttp package. '
+                "Install it with: pip install axm-agent[aiohttp]"
+            )
+        _aiohttp = aiohttp
+    return _aiohttp
+
+
+async def _close_with_loop(close: Callable[[], Awaitable[Any]]) -> AsyncGenerator[None, None]:
+    """Async generator that awaits close() when it is shut down"""
+    try:
+        yield
+    finally:
+        await close()
+
+
+def _close_on_loop_shutdown(close: Callable[[], Awaitable[Any]]) -> AsyncGenerator[None, None]:
+    """Run close() on the running event loop before that loop is closed.
+
+    asyncio.run() shuts down every async generator still open on its loop, so a
+    started generator that awaits close() in its finally block lets a loop-bound
+    client release its connections while its loop can still do so. The returned
+    generator must stay referenced; if it is collected first, the loop closes it
+    then.
+    """
+    guard = _close_with_loop(close)
+    try:
+        guard.asend(None).send(None)
+    except StopIteration:
+        pass
+    return guard
+
+
+_Guard = AsyncGenerator[None, None]
+
+
+class _LoopClients:
+    """Async clients kept one per event loop, each closed from its own loop.
+
+    httpx and aiohttp clients are bound to the loop they first ran on, so a provider
+    used from several loops (repeated asyncio.run, or one loop per thread) keeps a
+    client for each. A client is closed when its loop shuts down or by aclose() on
+    that loop, never because another loop asked for one.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], Any],
+        is_closed: Callable[[Any], bool],
+        close: Callable[[Any], Awaitable[Any]],
+    ) -> None:
+        self._build = build
+        self._is_closed = is_closed
+        self._close = close
+        # Each guard references its loop (asyncio stores the loop's finalizer on every
+        # async generator), so weak keys would never be freed; entries are removed by
+        # the guard itself instead
+        self._clients: Dict[asyncio.AbstractEventLoop, Tuple[Any, _Guard]] = {}
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Get the running loop's client, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is not None and not self._is_closed(entry[0]):
+            return entry[0]
+
+        client = self._build()
+
+        async def release() -> None:
+            with self._lock:
+                if self._clients.get(loop, (None,))[0] is client:
+                    del self._clients[loop]
+            await self._close(client)
+
+        guard = _close_on_loop_shutdown(release)
+        with self._lock:
+            # Loops closed without shutting down their async generators never run
+            # release(), so their entries are dropped here
+            for stale in [other for other in self._clients if other.is_closed()]:
+                del self._clients[stale]
+            self._clients[loop] = (client, guard)
+        return client
+
+    def __contains__(self, loop: asyncio.AbstractEventLoop) -> bool:
+        return loop in self._clients
+
+    async def aclose(self) -> None:
+        """Close the running loop's client, if it has one"""
+        entry = self._clients.get(asyncio.get_running_loop())
+        if entry is not None:
+            await entry[1].aclose()
+
+
+def _http_error(base_url: str, cls_name: str, status: int, text: str) -> Exception:
+    """Build the exception raised for an error status from the API"""
+    return Exception(f"HTTP error in {cls_name}: HTTP error from {base_url}: {status} - {text}")
+
+
+def _raise_for(exc: Exception, base_url: str, cls_name: str, timeout: float) -> NoReturn:
+    """Re-raise a requests, httpx or aiohttp transport error as a descriptive builtin exception"""
+    requests, httpx, aiohttp = _requests, _httpx, _aiohttp
+    if (
+        (requests is not None and isinstance(exc, requests.exceptions.ConnectionError))
+        or (httpx is not None and isinstance(exc, httpx.ConnectError))
+        # Any other aiohttp failure (server disconnects, broken payloads) is reported
+        # like requests reports aborted connections; its timeouts are handled below
+        or (
+            aiohttp is not None
+            and isinstance(exc, aiohttp.ClientError)
+            and not isinstance(exc, asyncio.TimeoutError)
+        )
+    ):
+        raise ConnectionError(
+            f"Failed to connect to {base_url}. "
+            f"Please check:\n"
+            f"  1. The base_url is correct\n"
+            f"  2. You have internet connectivity\n"
+            f"  3. The API endpoint is accessible from your network\n"
+            f"Original error: {exc}"
+        ) from exc
+    if (
+        (requests is not None and isinstance(exc, requests.exceptions.Timeout))
+        or (httpx is not None and isinstance(exc, httpx.TimeoutException))
+        or isinstance(exc, asyncio.TimeoutError)
+    ):
+        raise TimeoutError(
+            f"Timeout in {cls_name}: Request to {base_url} timed out after {timeout}s"
+        ) from exc
+    response = getattr(exc, "response", None)
+    if response is not None:
+        raise _http_error(base_url, cls_name, response.status_code, response.text) from exc
+    raise exc
+
+
+_OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+
+@lru_cache(maxsize=1)
+def _default_endpoint() -> Tuple[str, str, str, Tuple[str, ...]]:
+    """Resolve the endpoint defaults from the environment once per process.
+
+    Returns (base_url, api_key, openai_api_key, openai_base_urls). $OPENAI_API_KEY is
+    kept apart from the AXM_ key because it may only be sent to OpenAI's endpoint,
+    i.e. the default URL or $OPENAI_BASE_URL.
+
+    Call _default_endpoint.cache_clear() after changing the variables at runtime.
+    """
+    openai_base_url = os.environ.get("OPENAI_BASE_URL")
+    base_url = (
+        os.environ.get("AXM_OPENAI_COMPATIBLE_BASE_URL") or openai_base_url or _OPENAI_BASE_URL
+    )
+    openai_base_urls = tuple(url.rstrip("/") for url in (_OPENAI_BASE_URL, openai_base_url) if url)
+    return (
+        base_url,
+        os.environ.get("AXM_OPENAI_COMPATIBLE_API_KEY", ""),
+        os.environ.get("OPENAI_API_KEY", ""),
+        openai_base_urls,
     )
 
-from axm.core.types import Message
-from axm.llm.base import LLMProvider
+
+@lru_cache(maxsize=256)
+def _schema_instruction(response_format: Type[BaseModel]) -> str:
+    """Get the JSON-schema instruction for a response model, computed once per class"""
+    schema = _dumps(_schema_for(response_format)).decode("utf-8")
+    return (
+        f"\n\nReturn a JSON object matching this schema: {schema}\n"
+        "Directly reply json content. NEVER wrap it with markdown formats."
+    )
+
+
+# Server-sent event markers for streamed chat completions
+_SSE_DATA_PREFIX = b"data: "
+_SSE_DONE = b"[DONE]"
+
+
+class _SSEReader:
+    """Incremental parser turning raw SSE bytes into streamed content deltas.
+
+    Splits on newlines inside one growing buffer and passes a slice holding each
+    ``data:`` payload to the JSON parser (orjson when installed). Only data lines are
+    copied, each once, and no line is decoded to str.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self.done = False
+
+    def feed(self, chunk: bytes) -> List[str]:
+        """Consume a chunk of the response body and return the content deltas in it"""
+        buffer = self._buffer
+        buffer += chunk
+        find = buffer.find
+        startswith = buffer.startswith
+        loads = _loads
+        parse_errors = (JSONDecodeError, KeyError, IndexError)
+
+        contents: List[str] = []
+        start = 0
+        while True:
+            end = find(b"\n", start)
+            if end == -1:
+                break
+            line_start, line_end = start, end
+            start = end + 1
+            if not startswith(_SSE_DATA_PREFIX, line_start):
+                continue
+            if buffer[line_end - 1] == 0x0D:  # tolerate CRLF line endings
+                line_end -= 1
+
+            data = buffer[line_start + 6 : line_end]  # Remove "data: " prefix
+            if data.strip() == _SSE_DONE:
+                self.done = True
+                break
+
+            try:
+                delta = loads(data)["choices"][0].get("delta")
+            except parse_errors:
+                continue
+            if delta and delta.get("content"):
+                contents.append(delta["content"])
+
+        del buffer[:start]
+        return contents
+
+    def close(self) -> List[str]:
+        """Flush a final event that was not terminated by a newline"""
+        if self.done or not self._buffer:
+            return []
+        return self.feed(b"\n")
+
+
+# Opening fence line, then everything up to the last closing fence
+_MD_JSON_RE = re.compile(r"\A\s*```[^\n]*\n(.*)```", re.DOTALL)
 
 
 def _strip_markdown_json(content: str) -> str:
@@ -25,27 +407,32 @@ def _strip_markdown_json(content: str) -> str:
     Some LLMs wrap JSON in markdown ```json ... ``` blocks even when asked not to.
     This helper removes those wrappers.
     """
-    content = content.strip()
+    match = _MD_JSON_RE.match(content)
+    return match.group(1).strip() if match else content.strip()
+
+
+# Upper bound on converted messages kept per provider
+_MSG_CACHE_SIZE = 4096
 
-    # Check if wrapped in markdown code block
-    if content.startswith("```"):
-        # Find the first newline (end of opening ```)
-        first_newline = content.find("\n")
-        if first_newline != -1:
-            # Find the closing ```
-            last_backticks = content.rfind("```")
-            if last_backticks > first_newline:
-                # Extract content between markers
-                content = content[first_newline + 1 : last_backticks].strip()
 
-    return content
+def _message_to_dict(msg: Message) -> Dict[str, Any]:
+    """Convert one internal message to an OpenAI chat message dict"""
+    openai_msg: Dict[str, Any] = {"role": msg.role, "content": msg.content}
+    if msg.name:
+        openai_msg["name"] = msg.name
+    if msg.tool_calls:
+        openai_msg["tool_calls"] = msg.tool_calls
+    if msg.tool_call_id:
+        openai_msg["tool_call_id"] = msg.tool_call_id
+    return openai_msg
 
 
 class OpenAICompatibleProvider(LLMProvider):
     """OpenAI-compatible LLM provider using requests library
 
     Works with any API that follows the OpenAI chat completions format.
-    Reads AXM_OPENAI_COMPATIBLE_API_KEY and AXM_OPENAI_COMPATIBLE_BASE_URL from environment.
+    Reads AXM_OPENAI_COMPATIBLE_API_KEY and AXM_OPENAI_COMPATIBLE_BASE_URL from environment,
+    falling back to OPENAI_BASE_URL, and to OPENAI_API_KEY for OpenAI's own endpoint.
     """
 
     def __init__(
@@ -53,44 +440,234 @@ class OpenAICompatibleProvider(LLMProvider):
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
         timeout: int = 60,
+        cache_enabled: bool = False,
+        cache_size: int = 1024,
+        http2: bool = True,
+        stream_compression: bool = True,
+        warmup: bool = False,
+        transport: str = "httpx",
     ):
         """
         Initialize the OpenAI-compatible provider.
 
         Args:
-            api_key: API key for authentication (default: $AXM_OPENAI_COMPATIBLE_API_KEY)
-            base_url: Base URL for the API (default: $AXM_OPENAI_COMPATIBLE_BASE_URL)
+            api_key: API key for authentication
+                (default: $AXM_OPENAI_COMPATIBLE_API_KEY, then $OPENAI_API_KEY when
+                base_url is https://api.openai.com/v1 or $OPENAI_BASE_URL)
+            base_url: Base URL for the API (default: $AXM_OPENAI_COMPATIBLE_BASE_URL,
+                then $OPENAI_BASE_URL, then https://api.openai.com/v1)
             timeout: Request timeout in seconds
+            cache_enabled: Reuse responses for identical requests made at temperature 0
+            cache_size: Maximum number of cached responses (least recently used are evicted)
+            http2: Multiplex async requests over HTTP/2 (needs ``pip install httpx[http2]``)
+            stream_compression: Allow compressed streaming responses. Set to False for
+                servers that buffer compressed SSE streams, to request identity encoding
+            warmup: Connect the sync session to base_url in a background thread, so
+                the first generate()/stream() call skips the DNS/TCP/TLS handshake
+            transport: Client for agenerate(): "httpx", or "aiohttp" for higher
+                throughput at hundreds of concurrent requests (needs aiohttp)
         """
-        self.api_key = api_key or os.environ.get("AXM_OPENAI_COMPATIBLE_API_KEY", "")
-        self.base_url = (base_url or os.environ.get("AXM_OPENAI_COMPATIBLE_BASE_URL", "")).rstrip(
-            "/"
-        )
+        if transport not in ("httpx", "aiohttp"):
+            raise ValueError(f'transport must be "httpx" or "aiohttp", got {transport!r}')
+        if transport == "aiohttp":
+            _get_aiohttp()
+
+        if not api_key or not base_url:
+            default_base_url, default_api_key, openai_api_key, openai_base_urls = (
+                _default_endpoint()
+            )
+            base_url = base_url or default_base_url
+            if not api_key:
+                # Never send the OpenAI key to a third-party base_url
+                api_key = default_api_key or (
+                    openai_api_key if base_url.rstrip("/") in openai_base_urls else ""
+                )
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
 
         self.timeout = timeout
-
-    def _get_headers(self) -> Dict[str, str]:
-        """Get request headers with authentication"""
-        return {
+        self.cache_enabled = cache_enabled
+        self.cache_size = cache_size
+        self.http2 = http2
+        self.transport = transport
+        self._response_cache: "OrderedDict[bytes, Message]" = OrderedDict()
+        self._msg_cache: Dict[int, Tuple[Message, Dict[str, Any]]] = {}
+        # Agents sharing this provider may call it from several threads
+        self._cache_lock = threading.Lock()
+
+        # Built once; every request path reuses them
+        self._headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}",
         }
+        self._completions_url = f"{self.base_url}/chat/completions"
+        # requests and httpx already advertise every coding they can decode (gzip and
+        # deflate, plus br/zstd when brotli/zstandard are installed), so that header is
+        # left to them; streams can opt out per server
+        self._stream_headers = (
+            self._headers
+            if stream_compression
+            else {**self._headers, "Accept-Encoding": "identity"}
+        )
+
+        # Persistent HTTP clients, created lazily on first sync/async call
+        self._session: Optional["requests.Session"] = None
+        self._aclients = _LoopClients(
+            self._build_aclient, lambda client: client.is_closed, lambda client: client.aclose()
+        )
+        self._aiohttp_sessions = _LoopClients(
+            self._build_aiohttp_session,
+            lambda session: session.closed,
+            lambda session: session.close(),
+        )
+
+        if warmup and self.base_url.startswith(("http://", "https://")):
+            _warm_up(self.base_url, timeout)
+
+    def _get_session(self) -> "requests.Session":
+        """Get the persistent session, creating it on first use.
+
+        Sessions are pooled per base_url, so every provider (and agent) talking to
+        the same endpoint reuses one set of keep-alive connections.
+        """
+        if self._session is None:
+            self._session = _pooled_session(self.base_url)
+        return self._session
+
+    def _get_aclient(self) -> "httpx.AsyncClient":
+        """Get the running event loop's async client, creating it on first use.
+
+        httpx clients are bound to the event loop they first ran on, so each loop
+        (e.g. repeated asyncio.run, or one loop per thread) gets its own client,
+        which is closed when that loop shuts down.
+        """
+        return self._aclients.get()
+
+    def _build_aclient(self) -> "httpx.AsyncClient":
+        """Build an httpx client for the running event loop"""
+        httpx = _get_httpx()
+        http2 = self.http2
+        if http2 and not _http2_supported():
+            warnings.warn(
+                "HTTP/2 requires the h2 package; falling back to HTTP/1.1. "
+                "Install it with: pip install httpx[http2]",
+                RuntimeWarning,
+                stacklevel=4,
+            )
+            http2 = False
+        # HTTP/2 lets concurrent requests share one connection as separate streams;
+        # anyio already sets TCP_NODELAY on the sockets httpx opens
+        transport = httpx.AsyncHTTPTransport(
+            retries=2,
+            http2=http2,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        return httpx.AsyncClient(timeout=self.timeout, transport=transport)
+
+    def _get_aiohttp_session(self) -> Any:
+        """Get the running event loop's aiohttp session, kept per loop like _get_aclient()"""
+        return self._aiohttp_sessions.get()
+
+    def _build_aiohttp_session(self) -> Any:
+        """Build an aiohttp session for the running event loop"""
+        aiohttp = _get_aiohttp()
+        # No global connection cap; keep-alive sockets per host sized for large batches
+        connector = aiohttp.TCPConnector(limit=0, limit_per_host=200, keepalive_timeout=30)
+        return aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    async def _post_aiohttp(self, body: bytes) -> Dict[str, Any]:
+        """POST a chat completion request through aiohttp and return the decoded response"""
+        aiohttp = _get_aiohttp()
+        try:
+            session = self._get_aiohttp_session()
+            async with session.post(
+                self._completions_url, headers=self._headers, data=body
+            ) as response:
+                raw = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _raise_for(e, self.base_url, self.__class__.__name__, self.timeout)
+
+        if response.status >= 400:
+            text = raw.decode("utf-8", errors="replace")
+            raise _http_error(self.base_url, self.__class__.__name__, response.status, text)
+        return _loads(raw)
+
+    def close(self) -> None:
+        """Close pooled connections to this provider's base_url.
+
+        The session is shared with other providers for the same base_url; they
+        simply reconnect on their next request.
+        """
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    async def aclose(self) -> None:
+        """Close the async clients opened on the running event loop.
+
+        Clients used from other loops are closed when those loops shut down.
+        """
+        await self._aclients.aclose()
+        await self._aiohttp_sessions.aclose()
+
+    def _cache_key(self, body: bytes, temperature: float) -> Optional[bytes]:
+        """Get the response-cache key for a serialized request, if it may be cached.
+
+        Only deterministic (temperature 0) requests are cached, since sampled
+        responses are expected to differ between calls.
+        """
+        if not self.cache_enabled or temperature != 0:
+            return None
+        return hashlib.blake2b(body, digest_size=16).digest()
+
+    def _cache_get(self, key: Optional[bytes]) -> Optional[Message]:
+        """Look up a cached response, returning a copy the caller may mutate"""
+        if key is None:
+            return None
+        with self._cache_lock:
+            cached = self._response_cache.get(key)
+            if cached is None:
+                return None
+            self._response_cache.move_to_end(key)
+        return cached.model_copy(deep=True)
+
+    def _cache_put(self, key: Optional[bytes], message: Message) -> None:
+        """Store a response, evicting the least recently used entries"""
+        if key is None:
+            return
+        message = message.model_copy(deep=True)
+        with self._cache_lock:
+            self._response_cache[key] = message
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > self.cache_size:
+                self._response_cache.popitem(last=False)
+
+    def _get_headers(self) -> Dict[str, str]:
+        """Get request headers with authentication"""
+        return self._headers
 
     def _convert_messages(self, messages: List[Message]) -> List[Dict[str, Any]]:
-        """Convert internal messages to OpenAI format"""
+        """Convert internal messages to OpenAI format.
+
+        Agent loops resend the whole history every turn, so converted dicts are
+        cached per Message instance and only new messages are converted. Messages
+        are treated as immutable once sent, and the returned dicts must not be
+        modified in place.
+        """
+        cache = self._msg_cache
         result = []
-        for msg in messages:
-            openai_msg: Dict[str, Any] = {
-                "role": msg.role,
-                "content": msg.content,
-            }
-            if msg.name:
-                openai_msg["name"] = msg.name
-            if msg.tool_calls:
-                openai_msg["tool_calls"] = msg.tool_calls
-            if msg.tool_call_id:
-                openai_msg["tool_call_id"] = msg.tool_call_id
-            result.append(openai_msg)
+        with self._cache_lock:
+            for msg in messages:
+                entry = cache.get(id(msg))
+                # The cache holds a reference to msg, so its id cannot be reused
+                if entry is None or entry[0] is not msg:
+                    entry = (msg, _message_to_dict(msg))
+                    cache[id(msg)] = entry
+                    if len(cache) > _MSG_CACHE_SIZE:
+                        del cache[next(iter(cache))]
+                result.append(entry[1])
         return result
 
     def generate(
@@ -123,39 +700,36 @@ class OpenAICompatibleProvider(LLMProvider):
             payload["response_format"] = {"type": "json_object"}
             # Add instruction to return JSON
             if openai_messages:
-                schema = response_format.model_json_schema()
-                openai_messages[-1][
-                    "content"
-                ] += f"\n\nReturn a JSON object matching this schema: {schema}\nDirectly reply json content. NEVER wrap it with markdown formats."
+                # Copy the cached dict rather than extending it in place
+                last = openai_messages[-1]
+                openai_messages[-1] = {
+                    **last,
+                    "content": last["content"] + _schema_instruction(response_format),
+                }
 
+        body = _dumps(payload)
+        cache_key = self._cache_key(body, temperature)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        requests = _get_requests()
         try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=self._get_headers(),
-                json=payload,
+            response = self._get_session().post(
+                self._completions_url,
+                headers=self._headers,
+                data=body,
                 timeout=self.timeout,
             )
             response.raise_for_status()
-        except requests.exceptions.ConnectionError as e:
-            print(e)
-            raise ConnectionError(
-                f"Failed to connect to {self.base_url}. "
-                f"Please check:\n"
-                f"  1. The base_url is correct\n"
-                f"  2. You have internet connectivity\n"
-                f"  3. The API endpoint is accessible from your network\n"
-                f"Original error: {e}"
-            )
-        except requests.exceptions.Timeout:
-            raise TimeoutError(
-                f"Timeout in {self.__class__.__name__}: Request to {self.base_url} timed out after {self.timeout}s"
-            )
-        except requests.exceptions.HTTPError as e:
-            raise Exception(
-                f"HTTP error in {self.__class__.__name__}: HTTP error from {self.base_url}: {e.response.status_code} - {e.response.text}"
-            )
-
-        data = response.json()
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.HTTPError,
+        ) as e:
+            _raise_for(e, self.base_url, self.__class__.__name__, self.timeout)
+
+        data = _loads(response.content)
         choice = data["choices"][0]
         message = choice["message"]
 
@@ -174,16 +748,19 @@ class OpenAICompatibleProvider(LLMProvider):
                 for tc in message["tool_calls"]
             ]
 
-        # Clean content - remove markdown wrappers if present (common with structured output)
+        # Clean content - remove markdown wrappers if present (common with structured output).
+        # Compliant responses have no fence, so only a short prefix is checked.
         content = message.get("content") or ""
-        if response_format and content:
+        if response_format and "```" in content[:8]:
             content = _strip_markdown_json(content)
 
-        return Message(
+        result = Message(
             role="assistant",
             content=content,
             tool_calls=tool_calls,
         )
+        self._cache_put(cache_key, result)
+        return result
 
     async def agenerate(
         self,
@@ -213,35 +790,35 @@ class OpenAICompatibleProvider(LLMProvider):
         if response_format:
             payload["response_format"] = {"type": "json_object"}
             if openai_messages:
-                openai_messages[-1][
-                    "content"
-                ] += f"\n\nReturn a JSON object matching this schema: {response_format.model_json_schema()}"
+                # Copy the cached dict rather than extending it in place
+                last = openai_messages[-1]
+                openai_messages[-1] = {
+                    **last,
+                    "content": last["content"] + _schema_instruction(response_format),
+                }
 
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+        body = _dumps(payload)
+        cache_key = self._cache_key(body, temperature)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        if self.transport == "aiohttp":
+            data = await self._post_aiohttp(body)
+        else:
+            httpx = _get_httpx()
+            try:
+                client = self._get_aclient()
                 response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=self._get_headers(),
-                    json=payload,
+                    self._completions_url,
+                    headers=self._headers,
+                    content=body,
                 )
                 response.raise_for_status()
-        except httpx.ConnectError as e:
-            raise ConnectionError(
-                f"Failed to connect to {self.base_url}. "
-                f"Please check:\n"
-                f"  1. The base_url is correct\n"
-                f"  2. You have internet connectivity\n"
-                f"  3. The API endpoint is accessible from your network\n"
-                f"Original error: {e}"
-            )
-        except httpx.TimeoutException:
-            raise TimeoutError(f"Request to {self.base_url} timed out after {self.timeout}s")
-        except httpx.HTTPStatusError as e:
-            raise Exception(
-                f"HTTP error from {self.base_url}: {e.response.status_code} - {e.response.text}"
-            )
+            except (httpx.ConnectError, httpx.TimeoutException, httpx.HTTPStatusError) as e:
+                _raise_for(e, self.base_url, self.__class__.__name__, self.timeout)
+            data = _loads(response.content)
 
-        data = response.json()
         choice = data["choices"][0]
         message = choice["message"]
 
@@ -259,16 +836,19 @@ class OpenAICompatibleProvider(LLMProvider):
                 for tc in message["tool_calls"]
             ]
 
-        # Clean content - remove markdown wrappers if present (common with structured output)
+        # Clean content - remove markdown wrappers if present (common with structured output).
+        # Compliant responses have no fence, so only a short prefix is checked.
         content = message.get("content") or ""
-        if response_format and content:
+        if response_format and "```" in content[:8]:
             content = _strip_markdown_json(content)
 
-        return Message(
+        result = Message(
             role="assistant",
             content=content,
             tool_calls=tool_calls,
         )
+        self._cache_put(cache_key, result)
+        return result
 
     def stream(
         self,
@@ -290,32 +870,22 @@ class OpenAICompatibleProvider(LLMProvider):
         if max_tokens:
             payload["max_tokens"] = max_tokens
 
-        response = requests.post(
-            f"{self.base_url}/chat/completions",
-            headers=self._get_headers(),
-            json=payload,
+        response = self._get_session().post(
+            self._completions_url,
+            headers=self._stream_headers,
+            data=_dumps(payload),
             timeout=self.timeout,
             stream=True,
         )
         response.raise_for_status()
 
-        for line in response.iter_lines():
-            if not line:
-                continue
-
-            line = line.decode("utf-8")
-            if line.startswith("data: "):
-                data_str = line[6:]  # Remove "data: " prefix
-                if data_str.strip() == "[DONE]":
-                    break
-
-                try:
-                    chunk_data = json.loads(data_str)
-                    delta = chunk_data["choices"][0].get("delta", {})
-                    if "content" in delta and delta["content"]:
-                        yield delta["content"]
-                except (json.JSONDecodeError, KeyError, IndexError):
-                    continue
+        # Raw chunks avoid iter_lines' per-line allocations and decode
+        reader = _SSEReader()
+        for chunk in response.iter_content(chunk_size=4096):
+            yield from reader.feed(chunk)
+            if reader.done:
+                return
+        yield from reader.close()
 
     async def astream(
         self,
@@ -337,28 +907,21 @@ class OpenAICompatibleProvider(LLMProvider):
         if max_tokens:
             payload["max_tokens"] = max_tokens
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            async with client.stream(
-                "POST",
-                f"{self.base_url}/chat/completions",
-                headers=self._get_headers(),
-                json=payload,
-            ) as response:
-                response.raise_for_status()
+        client = self._get_aclient()
+        async with client.stream(
+            "POST",
+            self._completions_url,
+            headers=self._stream_headers,
+            content=_dumps(payload),
+        ) as response:
+            response.raise_for_status()
 
-                async for line in response.aiter_lines():
-                    if not line:
-                        continue
-
-                    if line.startswith("data: "):
-                        data_str = line[6:]  # Remove "data: " prefix
-                        if data_str.strip() == "[DONE]":
-                            break
-
-                        try:
-                            chunk_data = json.loads(data_str)
-                            delta = chunk_data["choices"][0].get("delta", {})
-                            if "content" in delta and delta["content"]:
-                                yield delta["content"]
-                        except (json.JSONDecodeError, KeyError, IndexError):
-                            continue
+            # aiter_bytes() without a chunk size yields data as soon as it arrives
+            reader = _SSEReader()
+            async for chunk in response.aiter_bytes():
+                for content in reader.feed(chunk):
+                    yield content
+                if reader.done:
+                    return
+            for content in reader.close():
+                yield content
@@ -28,11 +28,14 @@ def demo_agent_with_tools():
     print("DEMO 2: Agent with Custom Tools")
     print("="*60 + "\n")
 
-    agent = Agent("gpt-4")
+    # tool_cache=True adds cache_read/cache_write tools so results can be reused
+    agent = Agent("gpt-4", tool_cache=True)
+    lookups = {"count": 0}
 
     @agent.tool
     def get_user_info(user_id: int) -> dict:
         """Get user information by ID"""
+        lookups["count"] += 1
         # Simulated database
         users = {
             1: {"name": "Alice", "age": 30, "city": "New York"},
@@ -45,12 +48,16 @@ def demo_agent_with_tools():
         """Send an email"""
         return f"Email sent to {to} with subject: {subject}"
 
-    response = agent.run("Get information for user ID 1 and send them an email about their account")
-    print(f"Request: Get info for user 1 and send email")
-    print(f"Response: {response}\n")
+    response = agent.run(
+        "Get information for user ID 1 and send them an email about their account, "
+        "then look up user 1 again to confirm their city"
+    )
+    print(f"Request: Get info for user 1, send email, confirm user 1's city")
+    print(f"Response: {response}")
+    print(f"get_user_info lookups: {lookups['count']}\n")
 
 
-def demo_structured_output():
+def demo_structured_output(prompts=None):
     """Demo 3: Structured output with Pydantic"""
     print("\n" + "="*60)
     print("DEMO 3: Structured Output")
@@ -65,17 +72,21 @@ def demo_structured_output():
         rating: float
         why_recommended: str
 
-    agent = Agent("gpt-4")
-    movie = agent.run(
+    prompts = prompts or [
         "Recommend a sci-fi movie for someone who loves AI themes",
-        response_format=MovieRecommendation
-    )
+        "Recommend a thriller for someone who loves heist stories",
+    ]
 
-    print("Movie Recommendation:")
-    print(f"  Title: {movie.title} ({movie.year})")
-    print(f"  Genre: {movie.genre}")
-    print(f"  Rating: {movie.rating}/10")
-    print(f"  Why: {movie.why_recommended}\n")
+    agent = Agent("gpt-4")
+    # Prompts are independent, so send them concurrently instead of one by one
+    movies = agent.run_batch(prompts, response_format=MovieRecommendation)
+
+    for movie in movies:
+        print("Movie Recommendation:")
+        print(f"  Title: {movie.title} ({movie.year})")
+        print(f"  Genre: {movie.genre}")
+        print(f"  Rating: {movie.rating}/10")
+        print(f"  Why: {movie.why_recommended}\n")
 
 
 def demo_planning_agent():
@@ -1,6 +1,10 @@
 """Tests for the core Agent functionality"""
 
-from axm import Agent
+import subprocess
+import sys
+import threading
+
+from axm import Agent, register_provider
 from axm.core.types import Message
 from axm.llm.base import LLMProvider
 
@@ -12,9 +16,11 @@ class MockLLMProvider(LLMProvider):
         self.response_text = response_text
         self.generate_call_count = 0
         self.custom_generate = None  # For custom generate function
+        self._count_lock = threading.Lock()  # run_batch/collaborate call from threads
 
     def generate(self, messages, **kwargs):
-        self.generate_call_count += 1
+        with self._count_lock:
+            self.generate_call_count += 1
         # Use custom generate if provided
         if self.custom_generate:
             return self.custom_generate(messages, **kwargs)
@@ -34,6 +40,15 @@ class MockLLMProvider(LLMProvider):
         yield self.response_text
 
 
+def test_modules_import_on_their_own():
+    """Test that each public module can be the first axm module imported"""
+    for module in ["axm.llm.openai_compatible", "axm.llm.cache", "axm.core", "axm.core.agent"]:
+        result = subprocess.run(
+            [sys.executable, "-c", f"import {module}"], capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+
+
 def test_agent_initialization():
     """Test basic agent initialization"""
     mock_llm = MockLLMProvider()
@@ -54,6 +69,39 @@ def test_agent_with_system_prompt():
     assert agent.memory.messages[0].content == system_prompt
 
 
+def test_role_system_prompt_is_shared():
+    """Test agents with the same role share one system prompt string"""
+    researcher = Agent(MockLLMProvider(), role="researcher")
+    other = Agent(MockLLMProvider(), role="researcher")
+
+    assert researcher.memory.messages[0].content == "You are a researcher. Respond accordingly."
+    assert researcher.memory.messages[0].content is other.memory.messages[0].content
+
+
+class RegisteredMockProvider(MockLLMProvider):
+    """Mock provider constructed the way Agent builds providers from model names"""
+
+    def __init__(self, api_key=None, base_url=None):
+        super().__init__("Registered response")
+        self.base_url = base_url
+
+
+def test_register_provider():
+    """Test that registered prefixes pick the provider for a model name"""
+    from axm.core import agent as agent_module
+
+    register_provider("mock-", "tests.test_agent:RegisteredMockProvider")
+    try:
+        agent = Agent("mock-1", base_url="https://mock.test")
+        assert isinstance(agent.llm, RegisteredMockProvider)
+        assert agent.llm.base_url == "https://mock.test"
+        assert agent.run("Hi") == "Registered response"
+    finally:
+        agent_module._PROVIDER_BY_PREFIX.remove(
+            ("mock-", "tests.test_agent:RegisteredMockProvider")
+        )
+
+
 def test_tool_decorator():
     """Test tool decorator functionality"""
     mock_llm = MockLLMProvider()
@@ -130,6 +178,49 @@ def test_agent_with_tool_execution():
     assert call_count["value"] == 2
 
 
+def test_agent_tool_cache():
+    """Test cache_read/cache_write tools let the LLM reuse a tool result"""
+    mock_llm = MockLLMProvider()
+    agent = Agent(mock_llm, system_prompt="Be helpful.", tool_cache=True)
+
+    fetches = {"value": 0}
+
+    @agent.tool
+    def get_user_info(user_id: int) -> str:
+        fetches["value"] += 1
+        return "Alice"
+
+    assert "cache_read" in agent.tools and "cache_write" in agent.tools
+    assert agent.memory.messages[0].content.startswith("Be helpful.")
+    assert "cache_read(key)" in agent.memory.messages[0].content
+
+    def call(name, arguments):
+        return Message(
+            role="assistant",
+            content="",
+            tool_calls=[
+                {"id": name, "type": "function", "function": {"name": name, "arguments": arguments}}
+            ],
+        )
+
+    steps = iter(
+        [
+            call("cache_read", '{"key": "get_user_info:1"}'),
+            call("get_user_info", '{"user_id": 1}'),
+            call("cache_write", '{"key": "get_user_info:1", "value": "Alice"}'),
+            call("cache_read", '{"key": "get_user_info:1"}'),
+            Message(role="assistant", content="User 1 is Alice"),
+        ]
+    )
+    mock_llm.custom_generate = lambda messages, **kwargs: next(steps)
+
+    assert agent.run("Who is user 1? Check again to be sure.") == "User 1 is Alice"
+    assert fetches["value"] == 1
+    tool_results = [m.content for m in agent.memory.messages if m.role == "tool"]
+    assert tool_results == ["MISS", "Alice", "OK", "Alice"]
+    print("✓ Tool cache serves repeated lookups")
+
+
 def test_agent_reset():
     """Test agent memory reset"""
     mock_llm = MockLLMProvider()
@@ -146,3 +237,49 @@ def test_agent_reset():
     agent.reset()
     assert len(agent.memory.messages) == 1
     assert agent.memory.messages[0].content == "System message"
+
+
+async def test_abatch_generate():
+    """Test concurrent batch generation keeps order and reports failures"""
+    mock_llm = MockLLMProvider()
+
+    def mock_generate(messages, **kwargs):
+        if messages[-1].content == "fail":
+            raise ValueError("boom")
+        return Message(role="assistant", content=messages[-1].content.upper())
+
+    mock_llm.custom_generate = mock_generate
+
+    batches = [[Message(role="user", content=text)] for text in ["a", "fail", "c"]]
+    results = await mock_llm.abatch_generate(batches, max_concurrency=2)
+
+    assert results[0].content == "A"
+    assert isinstance(results[1], ValueError)
+    assert results[2].content == "C"
+    assert mock_llm.generate_call_count == 3
+
+
+def test_batch_marshal_generate():
+    """Test that prompts are packed k at a time and answers flattened in order"""
+    mock_llm = MockLLMProvider()
+    requests = []
+
+    def mock_generate(messages, **kwargs):
+        requests.append(messages[-1].content)
+        count = messages[-1].content.count(") prompt")
+        answers = ", ".join(f'"answer {len(requests)}.{i}"' for i in range(count))
+        return Message(role="assistant", content=f'{{"answers": [{answers}]}}')
+
+    mock_llm.custom_generate = mock_generate
+
+    results = mock_llm.batch_marshal_generate([f"prompt {i}" for i in range(5)], k=2)
+
+    assert len(requests) == 3
+    assert "1) prompt 0" in requests[0] and "2) prompt 1" in requests[0]
+    assert results == [
+        "answer 1.0",
+        "answer 1.1",
+        "answer 2.0",
+        "answer 2.1",
+        "answer 3.0",
+    ]
@@ -0,0 +1,180 @@
+"""Tests for batch processing"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from axm.core.agent import Agent
+from axm.core.batch import BatchProcessor
+from axm.core.types import Message
+from tests.test_agent import MockLLMProvider
+from tests.test_multi_agent import LoopBoundMockProvider, SlowMockLLMProvider
+
+
+class CountingMockLLMProvider(SlowMockLLMProvider):
+    """Mock provider that echoes the prompt and records concurrent calls"""
+
+    def __init__(self):
+        super().__init__(delay=0.01)
+
+    def generate(self, messages, **kwargs):
+        super().generate(messages, **kwargs)
+        return Message(role="assistant", content=f"echo: {messages[-1].content}")
+
+    async def agenerate(self, messages, **kwargs):
+        await super().agenerate(messages, **kwargs)
+        return Message(role="assistant", content=f"echo: {messages[-1].content}")
+
+
+def _as_async(func):
+    async def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+class FakeBatchClient:
+    """Stand-in for OpenAI's (or, with is_async, AsyncOpenAI's) files and batches resources"""
+
+    def __init__(self, is_async=False):
+        self.uploaded = None
+        self.retrieve_calls = 0
+        wrap = _as_async if is_async else (lambda func: func)
+        self.files = SimpleNamespace(
+            create=wrap(self._create_file), content=wrap(self._file_content)
+        )
+        self.batches = SimpleNamespace(
+            create=wrap(self._create_batch), retrieve=wrap(self._retrieve)
+        )
+
+    def _create_file(self, file, purpose):
+        assert purpose == "batch"
+        self.uploaded = [json.loads(line) for line in file[1].decode("utf-8").splitlines()]
+        return SimpleNamespace(id="file-in")
+
+    def _create_batch(self, input_file_id, endpoint, completion_window):
+        return SimpleNamespace(id="batch-1", status="validating", output_file_id=None)
+
+    def _retrieve(self, batch_id):
+        self.retrieve_calls += 1
+        return SimpleNamespace(id=batch_id, status="completed", output_file_id="file-out")
+
+    def _file_content(self, file_id):
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {"choices": [{"message": {"content": request["custom_id"]}}]},
+                    },
+                    "error": None,
+                }
+            )
+            for request in reversed(self.uploaded)
+        ]
+        return SimpleNamespace(text="\n".join(lines))
+
+
+class Answer(BaseModel):
+    value: int
+
+
+def test_batch_processor_bounds_concurrency():
+    """Test requests run concurrently up to max_concurrency and keep their order"""
+    provider = CountingMockLLMProvider()
+    processor = BatchProcessor(provider, max_concurrency=3, rate_limit_rpm=None)
+
+    requests = [[Message(role="user", content=str(i))] for i in range(10)]
+    results = processor.process(requests)
+
+    assert [r.content for r in results] == [f"echo: {i}" for i in range(10)]
+    assert provider.max_active == 3
+    print("✓ Concurrency is bounded and order is kept")
+
+
+async def test_batch_processor_aprocess_bounds_concurrency():
+    """Test the async path bounds concurrency the same way"""
+    provider = CountingMockLLMProvider()
+    processor = BatchProcessor(provider, max_concurrency=3, rate_limit_rpm=None)
+
+    requests = [[Message(role="user", content=str(i))] for i in range(10)]
+    results = await processor.aprocess(requests)
+
+    assert [r.content for r in results] == [f"echo: {i}" for i in range(10)]
+    assert provider.max_active == 3
+    print("✓ Async concurrency is bounded and order is kept")
+
+
+def test_agent_run_batch_structured():
+    """Test run_batch parses each response and leaves memory alone"""
+    provider = MockLLMProvider('{"value": 7}')
+    agent = Agent(provider, system_prompt="You are terse.")
+
+    results = agent.run_batch(["a", "b", "c"], response_format=Answer)
+
+    assert [r.value for r in results] == [7, 7, 7]
+    assert provider.generate_call_count == 3
+    assert len(agent.memory.messages) == 1
+    print("✓ run_batch returns structured results")
+
+
+def test_agent_run_batch_repeatedly_with_loop_bound_client():
+    """Test run_batch() can be called again, and from a running loop"""
+    provider = LoopBoundMockProvider("done")
+    agent = Agent(provider)
+
+    assert agent.run_batch(["a", "b"]) == ["done", "done"]
+    assert agent.run_batch(["c"]) == ["done"]
+
+    async def from_running_loop():
+        assert await agent.arun_batch(["d"]) == ["done"]
+        assert agent.run_batch(["e"]) == ["done"]
+
+    asyncio.run(from_running_loop())
+    assert provider.generate_call_count == 5
+    print("✓ run_batch() works repeatedly and inside a running loop")
+
+
+def test_batch_api_requires_openai_provider():
+    """Test use_batch_api rejects providers without the Batch API"""
+    processor = BatchProcessor(MockLLMProvider(), use_batch_api=True)
+
+    with pytest.raises(ValueError):
+        processor.process([[Message(role="user", content="hi")]])
+
+
+def test_batch_api_round_trip():
+    """Test Batch API submission, polling, and result ordering"""
+    provider = MockLLMProvider()
+    provider.client = FakeBatchClient()
+    processor = BatchProcessor(provider, use_batch_api=True, poll_interval=0)
+
+    requests = [[Message(role="user", content=str(i))] for i in range(3)]
+    results = processor.process(requests, model="gpt-4o-mini", response_format=Answer)
+
+    uploaded = provider.client.uploaded
+    assert [line["custom_id"] for line in uploaded] == ["request-0", "request-1", "request-2"]
+    assert uploaded[0]["body"]["model"] == "gpt-4o-mini"
+    assert uploaded[0]["body"]["response_format"] == {"type": "json_object"}
+    assert [r.content for r in results] == ["request-0", "request-1", "request-2"]
+    assert provider.client.retrieve_calls == 1
+    assert provider.generate_call_count == 0
+    print("✓ Batch API results are mapped back to their requests")
+
+
+async def test_batch_api_round_trip_async():
+    """Test the async path submits through the async client"""
+    provider = MockLLMProvider()
+    provider.async_client = FakeBatchClient(is_async=True)
+    processor = BatchProcessor(provider, use_batch_api=True, poll_interval=0)
+
+    requests = [[Message(role="user", content=str(i))] for i in range(3)]
+    results = await processor.aprocess(requests, model="gpt-4o-mini")
+
+    assert [r.content for r in results] == ["request-0", "request-1", "request-2"]
+    assert provider.async_client.retrieve_calls == 1
+    print("✓ Async Batch API results are mapped back to their requests")
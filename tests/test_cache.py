@@ -0,0 +1,190 @@
+"""Tests for LLM response caching"""
+
+import asyncio
+import threading
+import time
+
+from pydantic import BaseModel
+
+from axm import Agent
+from axm.core.types import Message
+from axm.llm.cache import InMemoryBackend, LLMCache, SemanticBackend
+from axm.llm.openai_compatible import OpenAICompatibleProvider
+from tests.test_agent import MockLLMProvider
+from tests.test_multi_agent import SlowMockLLMProvider
+
+
+class Answer(BaseModel):
+    value: int
+
+
+def test_in_memory_backend_lru_and_ttl():
+    """Test LRU eviction and expiry in the in-memory backend"""
+    backend = InMemoryBackend(max_size=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    assert backend.get("a") == "1"  # "a" becomes most recently used
+    backend.set("c", "3")
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    assert len(backend) == 2
+
+    backend = InMemoryBackend(ttl=0.01)
+    backend.set("a", "1")
+    time.sleep(0.02)
+    assert backend.get("a") is None
+
+
+def test_cache_key_only_for_deterministic_calls():
+    """Test that keys depend on the request and are skipped when sampling"""
+    cache = LLMCache()
+    messages = [Message(role="user", content="Hi")]
+
+    assert cache.make_key("gpt-4", messages, temperature=0.7) is None
+
+    key = cache.make_key("gpt-4", messages, temperature=0)
+    assert key == cache.make_key("gpt-4", list(messages), temperature=0)
+    assert key != cache.make_key("gpt-3.5", messages, temperature=0)
+    assert key != cache.make_key("gpt-4", messages, temperature=0, response_format=Answer)
+
+
+def test_cache_key_depends_on_provider():
+    """Test that agents on different providers or endpoints sharing a cache stay apart"""
+    cache = LLMCache()
+    messages = [Message(role="user", content="Hi")]
+    first = OpenAICompatibleProvider(api_key="k", base_url="https://one.test/v1")
+    second = OpenAICompatibleProvider(api_key="k", base_url="https://two.test/v1")
+
+    key = cache.make_key("custom", messages, temperature=0, provider=first)
+    assert key == cache.make_key(
+        "custom",
+        messages,
+        temperature=0,
+        provider=OpenAICompatibleProvider(api_key="other", base_url="https://one.test/v1"),
+    )
+    assert key != cache.make_key("custom", messages, temperature=0, provider=second)
+    assert key != cache.make_key("custom", messages, temperature=0, provider=MockLLMProvider())
+
+    class OtherMockLLMProvider(MockLLMProvider):
+        pass
+
+    mock_llm, other_llm = MockLLMProvider("Mock"), OtherMockLLMProvider("Other")
+    assert Agent(mock_llm, temperature=0, cache=cache).run("Hello") == "Mock"
+    assert Agent(other_llm, temperature=0, cache=cache).run("Hello") == "Other"
+    assert mock_llm.generate_call_count == other_llm.generate_call_count == 1
+    print("✓ Cache keys separate providers and endpoints")
+
+
+def test_agent_run_uses_cache():
+    """Test that identical deterministic runs only reach the LLM once"""
+    mock_llm = MockLLMProvider("Cached answer")
+    cache = LLMCache()
+
+    first = Agent(mock_llm, temperature=0, cache=cache)
+    second = Agent(mock_llm, temperature=0, cache=cache)
+
+    assert first.run("Hello") == "Cached answer"
+    assert second.run("Hello") == "Cached answer"
+    assert mock_llm.generate_call_count == 1
+
+    # The cached response is still recorded in memory
+    assert second.memory.messages[-1].content == "Cached answer"
+
+
+def test_agent_run_skips_cache_when_sampling():
+    """Test that non-zero temperature bypasses the cache"""
+    mock_llm = MockLLMProvider()
+    agent = Agent(mock_llm, temperature=0.7, cache=LLMCache())
+
+    agent.run("Hello")
+    agent.reset()
+    agent.run("Hello")
+    assert mock_llm.generate_call_count == 2
+
+
+async def test_agent_arun_uses_cache():
+    """Test that the async path shares the same cache"""
+    mock_llm = MockLLMProvider("Cached answer")
+    cache = LLMCache()
+
+    assert await Agent(mock_llm, temperature=0, cache=cache).arun("Hello") == "Cached answer"
+    assert Agent(mock_llm, temperature=0, cache=cache).run("Hello") == "Cached answer"
+    assert mock_llm.generate_call_count == 1
+
+
+async def test_agent_arun_coalesces_concurrent_calls():
+    """Test that identical concurrent runs share a single LLM request"""
+    mock_llm = SlowMockLLMProvider("Shared answer", delay=0.01)
+    cache = LLMCache()
+    agents = [Agent(mock_llm, temperature=0, cache=cache) for _ in range(3)]
+
+    results = await asyncio.gather(*(agent.arun("Hello") for agent in agents))
+    assert results == ["Shared answer"] * 3
+    assert mock_llm.generate_call_count == 1
+    assert not cache._pending
+
+    # Each agent records its own copy of the response
+    assert agents[0].memory.messages[-1] is not agents[1].memory.messages[-1]
+
+
+def _bag_of_words(text):
+    """Tiny deterministic embedder for tests"""
+    vocab = ["recommend", "sci-fi", "movie", "film", "ai", "weather", "paris"]
+    words = text.lower().replace(",", " ").split()
+    return [float(sum(word.startswith(v) for word in words)) for v in vocab]
+
+
+def test_semantic_backend_threshold_and_scope():
+    """Test near matches hit within a scope and unrelated prompts miss"""
+    backend = SemanticBackend(embedder=_bag_of_words, threshold=0.8)
+    backend.set("scope", "Recommend a sci-fi movie about AI", "cached")
+
+    assert backend.get("scope", "recommend sci-fi movie with AI") == "cached"
+    assert backend.get("scope", "weather in Paris") is None
+    assert backend.get("other-scope", "Recommend a sci-fi movie about AI") is None
+
+
+def test_agent_semantic_cache():
+    """Test that a similar prompt is answered from the semantic cache"""
+    mock_llm = MockLLMProvider("Try Ex Machina")
+    cache = LLMCache(semantic=SemanticBackend(embedder=_bag_of_words, threshold=0.8))
+
+    first = Agent(mock_llm, cache=cache)
+    second = Agent(mock_llm, cache=cache)
+
+    assert first.run("Recommend a sci-fi movie about AI") == "Try Ex Machina"
+    assert second.run("recommend sci-fi movie with AI") == "Try Ex Machina"
+    assert mock_llm.generate_call_count == 1
+
+    second.run("weather in Paris")
+    assert mock_llm.generate_call_count == 2
+    print("✓ Semantic cache answers near-identical prompts")
+
+
+async def test_agent_semantic_cache_embeds_off_the_event_loop():
+    """Test that the async path runs the embedder in a worker thread"""
+    loop_thread = threading.get_ident()
+    embed_threads = []
+
+    def embedder(text):
+        embed_threads.append(threading.get_ident())
+        return _bag_of_words(text)
+
+    mock_llm = MockLLMProvider("Try Ex Machina")
+    cache = LLMCache(semantic=SemanticBackend(embedder=embedder, threshold=0.8))
+
+    assert await Agent(mock_llm, cache=cache).arun("Recommend a sci-fi movie about AI")
+    assert await Agent(mock_llm, cache=cache).arun("recommend sci-fi movie with AI")
+    assert mock_llm.generate_call_count == 1
+    assert embed_threads
+    assert loop_thread not in embed_threads
+    print("✓ Semantic cache embeds prompts off the event loop")
+
+
+def test_agent_semantic_cache_flag():
+    """Test semantic_cache=True attaches a semantic backend"""
+    agent = Agent(MockLLMProvider(), semantic_cache=True, sim_threshold=0.9, cache_ttl=60)
+
+    assert isinstance(agent.cache.semantic, SemanticBackend)
+    assert agent.cache.semantic.threshold == 0.9
+    assert agent.cache.semantic.ttl == 60
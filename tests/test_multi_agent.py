@@ -0,0 +1,231 @@
+"""Tests for MultiAgent collaboration"""
+
+import asyncio
+import itertools
+import threading
+import time
+
+from axm.core.agent import Agent
+from axm.core.multi_agent import MultiAgent
+from axm.core.types import Message
+from tests.test_agent import MockLLMProvider
+
+
+class SlowMockLLMProvider(MockLLMProvider):
+    """Mock provider whose calls take a while and record their overlap"""
+
+    def __init__(self, response_text: str = "Mock response", delay: float = 0.05):
+        super().__init__(response_text)
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        with self._lock:
+            self.generate_call_count += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def _exit(self):
+        with self._lock:
+            self.active -= 1
+        return Message(role="assistant", content=self.response_text)
+
+    def generate(self, messages, **kwargs):
+        self._enter()
+        time.sleep(self.delay)
+        return self._exit()
+
+    async def agenerate(self, messages, **kwargs):
+        self._enter()
+        await asyncio.sleep(self.delay)
+        return self._exit()
+
+
+class LoopBoundMockProvider(MockLLMProvider):
+    """Mock provider whose async client, like httpx's, only works on its first event loop"""
+
+    def __init__(self, response_text: str = "Mock response"):
+        super().__init__(response_text)
+        self.loop = None
+
+    async def agenerate(self, messages, **kwargs):
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        elif self.loop is not loop:
+            raise RuntimeError("Event loop is closed")
+        return await super().agenerate(messages, **kwargs)
+
+
+def _make_team(worker_llm):
+    orchestrator_llm = MockLLMProvider()
+    replies = iter(["ASSIGN researcher: gather facts\nASSIGN writer: draft intro", "FINAL: done"])
+    orchestrator_llm.custom_generate = lambda messages, **kwargs: Message(
+        role="assistant", content=next(replies)
+    )
+    researcher = Agent(worker_llm, role="researcher")
+    writer = Agent(worker_llm, role="writer")
+    return MultiAgent([researcher, writer], orchestrator_model=orchestrator_llm)
+
+
+def test_collaborate_runs_round_in_parallel():
+    """Test agents assigned in the same round run concurrently"""
+    worker_llm = SlowMockLLMProvider("work result")
+    team = _make_team(worker_llm)
+
+    result = team.collaborate("Write an article", verbose=False)
+
+    assert result == "done"
+    assert worker_llm.generate_call_count == 2
+    assert worker_llm.max_active == 2
+    print("✓ Same-round assignments ran concurrently")
+
+
+def test_collaborate_sequential():
+    """Test parallel=False runs assignments one at a time"""
+    worker_llm = SlowMockLLMProvider("work result")
+    team = _make_team(worker_llm)
+
+    result = team.collaborate("Write an article", verbose=False, parallel=False)
+
+    assert result == "done"
+    assert worker_llm.generate_call_count == 2
+    assert worker_llm.max_active == 1
+    print("✓ Sequential collaboration works")
+
+
+async def test_collaborate_async():
+    """Test collaborate_async inside a running event loop"""
+    worker_llm = SlowMockLLMProvider("work result")
+    team = _make_team(worker_llm)
+
+    result = await team.collaborate_async("Write an article", verbose=False)
+
+    assert result == "done"
+    assert worker_llm.generate_call_count == 2
+    print("✓ collaborate_async works")
+
+
+def test_collaborate_repeatedly_with_loop_bound_client():
+    """Test collaborate() can be called again, and from a running loop"""
+    worker_llm = LoopBoundMockProvider("work result")
+    orchestrator_llm = LoopBoundMockProvider()
+    replies = itertools.cycle(
+        ["ASSIGN researcher: gather facts\nASSIGN writer: draft", "FINAL: ok"]
+    )
+    orchestrator_llm.custom_generate = lambda messages, **kwargs: Message(
+        role="assistant", content=next(replies)
+    )
+    team = MultiAgent(
+        [Agent(worker_llm, role="researcher"), Agent(worker_llm, role="writer")],
+        orchestrator_model=orchestrator_llm,
+    )
+
+    assert team.collaborate("First task", verbose=False) == "ok"
+    assert team.collaborate("Second task", verbose=False) == "ok"
+
+    async def from_running_loop():
+        assert await team.collaborate_async("Async task", verbose=False) == "ok"
+        assert team.collaborate("Nested task", verbose=False) == "ok"
+
+    asyncio.run(from_running_loop())
+    assert worker_llm.generate_call_count == 8
+    print("✓ collaborate() works repeatedly and inside a running loop")
+
+
+def test_endpoints_round_robin():
+    """Test agents are spread over the given endpoints in turn"""
+    endpoints = [
+        {"base_url": "https://a.test/v1", "api_key": "key-a"},
+        {"base_url": "https://b.test/v1", "api_key": "key-b"},
+    ]
+    agents = [Agent("deepseek-v3", role=role) for role in ("researcher", "writer", "editor")]
+    fixed_llm = MockLLMProvider()
+    agents.append(Agent(fixed_llm, role="critic"))
+
+    team = MultiAgent(agents, orchestrator_model="deepseek-v3", endpoints=endpoints)
+
+    base_urls = [team.get_agent(r).llm.base_url for r in ("researcher", "writer", "editor")]
+    assert base_urls == ["https://a.test/v1", "https://b.test/v1", "https://a.test/v1"]
+    assert team.get_agent("researcher").llm is team.get_agent("editor").llm
+    assert team.get_agent("critic").llm is fixed_llm
+    assert team.orchestrator.llm.base_url == "https://a.test/v1"
+    assert team.orchestrator.llm.api_key == "key-a"
+
+    team.add_agent(Agent("deepseek-v3", role="fact_checker"))
+    assert team.get_agent("fact_checker").llm.base_url == "https://b.test/v1"
+    print("✓ Endpoints are assigned round-robin")
+
+
+def test_orchestrator_reused_across_collaborations():
+    """Test one orchestrator provider serves every call without carrying over a conversation"""
+    worker_llm = SlowMockLLMProvider("work result", delay=0)
+    team = _make_team(worker_llm)
+    orchestrator = team.orchestrator
+    sent = []
+
+    def reply(messages, **kwargs):
+        sent.append(list(messages))
+        return Message(role="assistant", content="FINAL: done")
+
+    orchestrator.llm.custom_generate = reply
+
+    assert team.collaborate("First task", verbose=False) == "done"
+    assert team.collaborate("Second task", verbose=False) == "done"
+
+    assert team.orchestrator is orchestrator
+    assert [m.role for m in sent[1]] == ["system", "user"]
+    assert "Second task" in sent[1][1].content
+    assert [m.role for m in orchestrator.memory.messages] == ["system"]
+    print("✓ Orchestrator is reused with a fresh conversation per collaboration")
+
+
+async def test_concurrent_collaborations_keep_separate_conversations():
+    """Test concurrent collaborate_async calls do not see each other's messages"""
+    orchestrator_llm = MockLLMProvider()
+    sent = []
+
+    async def reply(messages, **kwargs):
+        sent.append(list(messages))
+        await asyncio.sleep(0.01)
+        task = messages[-1].content.splitlines()[0]
+        if "Previous work:\nNo previous work." in messages[-1].content:
+            return Message(role="assistant", content="ASSIGN researcher: look into it")
+        return Message(role="assistant", content=f"FINAL: {task}")
+
+    orchestrator_llm.agenerate = reply
+    team = MultiAgent(
+        [Agent(SlowMockLLMProvider("notes", delay=0.01), role="researcher")],
+        orchestrator_model=orchestrator_llm,
+    )
+
+    results = await asyncio.gather(
+        team.collaborate_async("alpha", verbose=False),
+        team.collaborate_async("beta", verbose=False),
+    )
+
+    assert results == ["Task: alpha", "Task: beta"]
+    for messages in sent:
+        tasks = {m.content.splitlines()[0] for m in messages if m.role == "user"}
+        assert len(tasks) == 1
+    print("✓ Concurrent collaborations keep separate conversations")
+
+
+def test_add_agent_updates_sent_orchestrator_prompt():
+    """Test add_agent's new role reaches a provider that caches converted messages"""
+    from axm.llm.openai_compatible import OpenAICompatibleProvider
+
+    provider = OpenAICompatibleProvider(
+        api_key="test-key", base_url="https://custom-endpoint.com/v1"
+    )
+    team = MultiAgent([Agent(MockLLMProvider(), role="researcher")], orchestrator_model=provider)
+    first = provider._convert_messages(team.orchestrator.memory.messages)
+    assert "editor" not in first[0]["content"]
+
+    team.add_agent(Agent(MockLLMProvider(), role="editor"))
+
+    second = provider._convert_messages(team.orchestrator.memory.messages)
+    assert "researcher, editor" in second[0]["content"]
+    print("✓ add_agent updates the prompt the orchestrator sends")
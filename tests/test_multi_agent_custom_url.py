@@ -1,13 +1,17 @@
 """Test MultiAgent with custom base_url and api_key"""
 
 import os
+
+import pytest
+
 from axm.core.agent import Agent
 from axm.core.multi_agent import MultiAgent
-from axm.llm.openai_compatible import OpenAICompatibleProvider
+from axm.llm.openai_compatible import OpenAICompatibleProvider, _default_endpoint
 
 MODEL = "deepseek-v3-250324"
 BASE_URL = "https://ark.cn-beijing.volces.com/api/v3"
 API_KEY = os.environ.get("AXM_OPENAI_COMPATIBLE_API_KEY", "test-key")
+ENV_VARS = ("AXM_OPENAI_COMPATIBLE_BASE_URL", "AXM_OPENAI_COMPATIBLE_API_KEY")
 
 
 def test_multi_agent_with_custom_url():
@@ -38,6 +42,12 @@ def test_multi_agent_with_custom_url():
     assert team.orchestrator.llm.base_url == BASE_URL
     print(f"✅ Orchestrator created with custom base_url: {BASE_URL}")
 
+    # Providers for the same endpoint share one pooled HTTP session
+    session = researcher.llm._get_session()
+    assert writer.llm._get_session() is session
+    assert team.orchestrator.llm._get_session() is session
+    print("✅ Agents share a pooled HTTP session")
+
     # Test collaboration
     print("\n🤝 Testing collaboration...")
     result = team.collaborate(
@@ -52,30 +62,41 @@ def test_multi_agent_with_custom_url():
     print("\n✅ All tests passed!")
 
 
+@pytest.mark.xdist_group("env")
 def test_environment_variables():
     """Test that AXM_OPENAI_COMPATIBLE_* environment variables work"""
     print("\n" + "=" * 60)
     print("TEST: Environment Variables")
     print("=" * 60 + "\n")
 
-    # Set environment variables
+    # Set environment variables (restored afterwards so other tests see the original env)
+    saved = {name: os.environ.get(name) for name in ENV_VARS}
     os.environ["AXM_OPENAI_COMPATIBLE_BASE_URL"] = BASE_URL
     os.environ["AXM_OPENAI_COMPATIBLE_API_KEY"] = API_KEY
-
-    # Create provider without explicit parameters
-    provider = OpenAICompatibleProvider()
-
-    # Verify environment variables were used
-    assert provider.base_url == BASE_URL
-    assert provider.api_key == API_KEY
-    print(f"✅ Provider used AXM_OPENAI_COMPATIBLE_BASE_URL: {BASE_URL}")
-    print(f"✅ Provider used AXM_OPENAI_COMPATIBLE_API_KEY: {API_KEY[:10]}...")
-
-    # Create agent without explicit parameters
-    agent = Agent(model=MODEL)
-    assert isinstance(agent.llm, OpenAICompatibleProvider)
-    assert agent.llm.base_url == BASE_URL
-    print("✅ Agent used environment variables correctly")
+    _default_endpoint.cache_clear()
+
+    try:
+        # Create provider without explicit parameters
+        provider = OpenAICompatibleProvider()
+
+        # Verify environment variables were used
+        assert provider.base_url == BASE_URL
+        assert provider.api_key == API_KEY
+        print(f"✅ Provider used AXM_OPENAI_COMPATIBLE_BASE_URL: {BASE_URL}")
+        print(f"✅ Provider used AXM_OPENAI_COMPATIBLE_API_KEY: {API_KEY[:10]}...")
+
+        # Create agent without explicit parameters
+        agent = Agent(model=MODEL)
+        assert isinstance(agent.llm, OpenAICompatibleProvider)
+        assert agent.llm.base_url == BASE_URL
+        print("✅ Agent used environment variables correctly")
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        _default_endpoint.cache_clear()
 
     print("\n✅ All environment variable tests passed!")
 
@@ -1,8 +1,26 @@
 """Test script to verify OpenAICompatibleProvider works correctly"""
 
+import asyncio
+import json
 import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+import requests
+
 from axm.core.agent import Agent
-from axm.llm.openai_compatible import OpenAICompatibleProvider
+from axm.core.types import Message
+from axm.llm.openai_compatible import (
+    OpenAICompatibleProvider,
+    _SSEReader,
+    _default_endpoint,
+    _strip_markdown_json,
+)
 
 
 def test_openai_compatible_provider_direct():
@@ -18,6 +36,7 @@ def test_openai_compatible_provider_direct():
     print("✓ OpenAICompatibleProvider direct instantiation test passed")
 
 
+@pytest.mark.xdist_group("env")
 def test_openai_compatible_provider_env_var():
     """Test that OpenAICompatibleProvider reads from environment variables"""
     provider = OpenAICompatibleProvider()
@@ -33,6 +52,39 @@ def test_openai_compatible_provider_env_var():
     print("✓ OpenAICompatibleProvider environment variable test passed")
 
 
+@pytest.mark.xdist_group("env")
+def test_openai_api_key_not_sent_to_custom_base_url():
+    """Test that $OPENAI_API_KEY is only used for OpenAI's own endpoint"""
+    env = {"OPENAI_API_KEY": "sk-openai-secret"}
+    custom_url = "https://ark.cn-beijing.volces.com/api/v3"
+    try:
+        with mock.patch.dict(os.environ, env):
+            for name in ("OPENAI_BASE_URL", "AXM_OPENAI_COMPATIBLE_BASE_URL"):
+                os.environ.pop(name, None)
+            os.environ.pop("AXM_OPENAI_COMPATIBLE_API_KEY", None)
+            _default_endpoint.cache_clear()
+
+            agent = Agent("deepseek-v3", base_url=custom_url)
+            assert agent.llm.api_key == ""
+            assert "sk-openai-secret" not in agent.llm._headers["Authorization"]
+
+            assert OpenAICompatibleProvider().api_key == "sk-openai-secret"
+            explicit = OpenAICompatibleProvider(base_url="https://api.openai.com/v1/")
+            assert explicit.api_key == "sk-openai-secret"
+
+            os.environ["AXM_OPENAI_COMPATIBLE_BASE_URL"] = custom_url
+            _default_endpoint.cache_clear()
+            assert OpenAICompatibleProvider().api_key == ""
+
+            os.environ["OPENAI_BASE_URL"] = "https://openai-proxy.test/v1"
+            _default_endpoint.cache_clear()
+            proxied = OpenAICompatibleProvider(base_url="https://openai-proxy.test/v1")
+            assert proxied.api_key == "sk-openai-secret"
+    finally:
+        _default_endpoint.cache_clear()
+    print("✓ OpenAI API key scoping test passed")
+
+
 def test_agent_uses_openai_compatible_for_custom_model():
     """Test that Agent uses OpenAICompatibleProvider for non-standard model names"""
     agent = Agent(
@@ -76,6 +128,18 @@ def test_agent_still_uses_openai_for_gpt():
         print("⊘ OpenAI test skipped (openai package not installed)")
 
 
+def test_openai_provider_uses_http2():
+    """Test that OpenAIProvider clients negotiate HTTP/2 when h2 is installed"""
+    pytest.importorskip("openai")
+    pytest.importorskip("h2")
+    from axm.llm.openai import OpenAIProvider
+
+    provider = OpenAIProvider(api_key="test-key", base_url="http://localhost:8000/v1")
+    assert provider.client._client._transport._pool._http2 is True
+    assert provider.async_client._client._transport._pool._http2 is True
+    print("✓ OpenAI provider HTTP/2 test passed")
+
+
 def test_agent_still_uses_anthropic_for_claude():
     """Test that Agent still uses Anthropic provider for claude models"""
     try:
@@ -90,12 +154,323 @@ def test_agent_still_uses_anthropic_for_claude():
         print("⊘ Anthropic test skipped (anthropic package not installed)")
 
 
+def test_strip_markdown_json():
+    """Test that markdown fences around JSON are removed"""
+    assert _strip_markdown_json('```json\n{"a": 1}\n```') == '{"a": 1}'
+    assert _strip_markdown_json('  ```\n{"a": 1}```  ') == '{"a": 1}'
+    assert _strip_markdown_json('```JSON\n{"a": "`"}\n```\nDone.') == '{"a": "`"}'
+    assert _strip_markdown_json(' {"a": 1} ') == '{"a": 1}'
+    assert _strip_markdown_json("```json {}") == "```json {}"
+    print("✓ Markdown JSON stripping test passed")
+
+
+def test_openai_compatible_provider_response_cache():
+    """Test that only deterministic requests are cached, with LRU eviction"""
+    provider = OpenAICompatibleProvider(
+        api_key="test-key", base_url="https://custom-endpoint.com/v1"
+    )
+    assert provider._cache_key(b"{}", temperature=0) is None
+
+    provider = OpenAICompatibleProvider(
+        api_key="test-key",
+        base_url="https://custom-endpoint.com/v1",
+        cache_enabled=True,
+        cache_size=1,
+    )
+    assert provider._cache_key(b"{}", temperature=0.7) is None
+
+    key_a = provider._cache_key(b'{"a": 1}', temperature=0)
+    key_b = provider._cache_key(b'{"b": 2}', temperature=0)
+    provider._cache_put(key_a, Message(role="assistant", content="A"))
+    cached = provider._cache_get(key_a)
+    assert cached.content == "A"
+    assert cached is not provider._cache_get(key_a)
+
+    provider._cache_put(key_b, Message(role="assistant", content="B"))
+    assert provider._cache_get(key_a) is None
+    assert provider._cache_get(key_b).content == "B"
+    print("✓ OpenAICompatibleProvider response cache test passed")
+
+
+def test_convert_messages_reuses_converted_history():
+    """Test that already-converted messages are reused across calls"""
+    provider = OpenAICompatibleProvider(
+        api_key="test-key", base_url="https://custom-endpoint.com/v1"
+    )
+    history = [
+        Message(role="system", content="Be brief"),
+        Message(role="user", content="Hi"),
+    ]
+
+    first = provider._convert_messages(history)
+    history.append(Message(role="tool", content="42", tool_call_id="call_1", name="answer"))
+    second = provider._convert_messages(history)
+
+    assert second[0] is first[0]
+    assert second[1] is first[1]
+    assert second[2] == {
+        "role": "tool",
+        "content": "42",
+        "name": "answer",
+        "tool_call_id": "call_1",
+    }
+    print("✓ Message conversion cache test passed")
+
+
+def test_sse_reader_splits_events_across_chunks():
+    """Test that the SSE reader handles split chunks, CRLF and [DONE]"""
+    body = (
+        b'data: {"choices":[{"delta":{"content":"Hel"}}]}\r\n\r\n'
+        b": keep-alive\n\n"
+        b'data: {"choices":[{"delta":{"role":"assistant"}}]}\n\n'
+        b'data: {"choices":[{"delta":{"content":"lo"}}]}\n\n'
+        b"data: [DONE]\n\n"
+        b'data: {"choices":[{"delta":{"content":"ignored"}}]}\n\n'
+    )
+    reader = _SSEReader()
+    contents = []
+    for i in range(0, len(body), 7):
+        contents.extend(reader.feed(body[i : i + 7]))
+        if reader.done:
+            break
+
+    assert contents == ["Hel", "lo"]
+    assert reader.done
+
+    reader = _SSEReader()
+    assert reader.feed(b'data: {"choices":[{"delta":{"content":"end"}}]}') == []
+    assert reader.close() == ["end"]
+    print("✓ SSE reader test passed")
+
+
+def test_openai_compatible_provider_warmup():
+    """Test that construction pre-connects once per base_url only when asked to"""
+    heads = []
+    warmed = threading.Event()
+
+    def fake_head(session, url, **kwargs):
+        heads.append(url)
+        warmed.set()
+
+    with mock.patch.object(requests.Session, "head", fake_head):
+        OpenAICompatibleProvider(base_url="https://warmup-off.test/v1")
+        OpenAICompatibleProvider(base_url="https://warmup.test/v1", warmup=True)
+        assert warmed.wait(timeout=5)
+        OpenAICompatibleProvider(base_url="https://warmup.test/v1", warmup=True)
+
+    assert heads == ["https://warmup.test/v1"]
+
+    # Without warm-up, async-only use never imports requests
+    code = (
+        "import sys\n"
+        "from axm.llm.openai_compatible import OpenAICompatibleProvider\n"
+        "OpenAICompatibleProvider(base_url='https://custom-endpoint.com/v1')\n"
+        "assert 'requests' not in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    print("✓ OpenAICompatibleProvider warmup test passed")
+
+
+def test_openai_compatible_provider_rejects_unknown_transport():
+    """Test that only the supported async transports are accepted"""
+    with pytest.raises(ValueError):
+        OpenAICompatibleProvider(base_url="https://custom-endpoint.com/v1", transport="curl")
+    print("✓ OpenAICompatibleProvider transport validation test passed")
+
+
+def test_openai_compatible_provider_closes_client_with_its_loop():
+    """Test that each event loop's async client is closed before the loop is"""
+    provider = OpenAICompatibleProvider(
+        api_key="test-key", base_url="https://custom-endpoint.com/v1", http2=False
+    )
+
+    async def get_client():
+        return provider._get_aclient()
+
+    first = asyncio.run(get_client())
+    assert first.is_closed
+    second = asyncio.run(get_client())
+    assert second is not first
+    assert second.is_closed
+
+    async def reuse_then_close():
+        client = provider._get_aclient()
+        assert provider._get_aclient() is client
+        await provider.aclose()
+        assert client.is_closed
+        assert asyncio.get_running_loop() not in provider._aclients
+
+    asyncio.run(reuse_then_close())
+    print("✓ OpenAICompatibleProvider async client lifetime test passed")
+
+
+class _SlowCompletionsHandler(BaseHTTPRequestHandler):
+    """Chat completions endpoint that answers after a short delay"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(0.05)
+        content = f"echo: {body['messages'][-1]['content']}"
+        payload = json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class _UnavailableHandler(BaseHTTPRequestHandler):
+    """Chat completions endpoint that always answers 503"""
+
+    protocol_version = "HTTP/1.1"
+    posts = 0
+
+    def do_POST(self):
+        type(self).posts += 1
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_openai_compatible_provider_does_not_retry_posts():
+    """Test that error statuses are not retried, since completions are not idempotent"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _UnavailableHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    provider = OpenAICompatibleProvider(
+        api_key="test-key", base_url=f"http://127.0.0.1:{server.server_port}/v1"
+    )
+    try:
+        with pytest.raises(Exception, match="503"):
+            provider.generate([Message(role="user", content="Hi")])
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert _UnavailableHandler.posts == 1
+
+    retry = provider._get_session().get_adapter(provider.base_url).max_retries
+    assert retry.connect == 2
+    assert retry.read == 0
+    print("✓ OpenAICompatibleProvider retry policy test passed")
+
+
+def test_openai_compatible_provider_shared_across_loops_in_threads():
+    """Test that loops running at once in several threads each keep their own client"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowCompletionsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    provider = OpenAICompatibleProvider(
+        api_key="test-key", base_url=f"http://127.0.0.1:{server.server_port}/v1", http2=False
+    )
+    start = threading.Barrier(4)
+    results, errors = [], []
+
+    async def run(worker):
+        start.wait()
+        return await asyncio.gather(
+            *(provider.agenerate([Message(role="user", content=f"{worker}-{i}")]) for i in range(3))
+        )
+
+    def worker(n):
+        try:
+            results.extend(message.content for message in asyncio.run(run(n)))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert errors == []
+    assert sorted(results) == sorted(f"echo: {n}-{i}" for n in range(4) for i in range(3))
+    print("✓ OpenAICompatibleProvider multi-loop client test passed")
+
+
+async def test_openai_compatible_provider_aiohttp_transport():
+    """Test agenerate through the aiohttp transport against a local server"""
+    web = pytest.importorskip("aiohttp.web")
+
+    async def completions(request):
+        body = await request.json()
+        content = f"echo: {body['messages'][-1]['content']}"
+        return web.json_response({"choices": [{"message": {"content": content}}]})
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    provider = OpenAICompatibleProvider(
+        api_key="test-key",
+        base_url=f"http://127.0.0.1:{port}/v1",
+        transport="aiohttp",
+    )
+    try:
+        response = await provider.agenerate([Message(role="user", content="Hi")])
+        assert response.content == "echo: Hi"
+    finally:
+        await provider.aclose()
+        await runner.cleanup()
+    print("✓ OpenAICompatibleProvider aiohttp transport test passed")
+
+
+async def test_openai_compatible_provider_aiohttp_maps_client_errors():
+    """Test that aiohttp failures surface as the same builtin errors as httpx's"""
+    pytest.importorskip("aiohttp")
+
+    async def hang_up(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.close()
+
+    server = await asyncio.start_server(hang_up, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    provider = OpenAICompatibleProvider(
+        api_key="test-key", base_url=f"http://127.0.0.1:{port}/v1", transport="aiohttp"
+    )
+    try:
+        with pytest.raises(ConnectionError) as excinfo:
+            await provider.agenerate([Message(role="user", content="Hi")])
+        assert type(excinfo.value.__cause__).__name__ == "ServerDisconnectedError"
+    finally:
+        await provider.aclose()
+        server.close()
+        await server.wait_closed()
+    print("✓ OpenAICompatibleProvider aiohttp error mapping test passed")
+
+
 if __name__ == "__main__":
     print("Testing OpenAICompatibleProvider implementation...\n")
     test_openai_compatible_provider_direct()
     test_openai_compatible_provider_env_var()
+    test_openai_api_key_not_sent_to_custom_base_url()
     test_agent_uses_openai_compatible_for_custom_model()
     test_openai_compatible_provider_as_model()
     test_agent_still_uses_openai_for_gpt()
     test_agent_still_uses_anthropic_for_claude()
+    test_strip_markdown_json()
+    test_openai_compatible_provider_response_cache()
+    test_convert_messages_reuses_converted_history()
+    test_sse_reader_splits_events_across_chunks()
+    test_openai_compatible_provider_warmup()
+    test_openai_compatible_provider_rejects_unknown_transport()
+    test_openai_compatible_provider_closes_client_with_its_loop()
+    test_openai_compatible_provider_does_not_retry_posts()
+    test_openai_compatible_provider_shared_across_loops_in_threads()
     print("\n✓ All OpenAICompatibleProvider tests passed!")
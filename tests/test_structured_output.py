@@ -1,8 +1,12 @@
 """Test structured output with markdown stripping"""
 
 import os
+
+import pytest
 from pydantic import BaseModel
+
 from axm.core.agent import Agent
+from tests.test_agent import MockLLMProvider
 
 MODEL = "deepseek-v3-250324"
 BASE_URL = "https://ark.cn-beijing.volces.com/api/v3"
@@ -39,5 +43,47 @@ def test_structured_output():
     print("✅ Test passed! Structured output working correctly.")
 
 
+def test_structured_output_parses_fenced_and_raw_json():
+    """Test that raw JSON and markdown-fenced JSON both parse"""
+    payload = (
+        '{"title": "Ex Machina", "year": 2014, "genre": "sci-fi", "rating": 7.7, '
+        '"why_recommended": "AI themes"}'
+    )
+    for content in [payload, f"  {payload}\n", f"```json\n{payload}\n```", f"```\n{payload}```"]:
+        agent = Agent(MockLLMProvider(content))
+        movie = agent.run("Recommend a movie", response_format=MovieRecommendation)
+        assert movie == MovieRecommendation.model_validate_json(payload)
+
+    agent = Agent(MockLLMProvider("Sorry, I can't help with that."))
+    with pytest.raises(ValueError):
+        agent.run("Recommend a movie", response_format=MovieRecommendation)
+    print("✅ Fenced and raw JSON both parse.")
+
+
+def test_trusted_structured_output_skips_validation():
+    """Test that trusted structured output is constructed without validation"""
+    payload = (
+        '{"title": "Ex Machina", "year": "2014", "genre": "sci-fi", "rating": 7.7, '
+        '"why_recommended": "AI themes"}'
+    )
+    agent = Agent(MockLLMProvider(f"```json\n{payload}\n```"), trusted_structured_output=True)
+    movie = agent.run("Recommend a movie", response_format=MovieRecommendation)
+    assert isinstance(movie, MovieRecommendation)
+    assert movie.title == "Ex Machina"
+    assert movie.year == "2014"  # no coercion on the trusted path
+
+    validated = Agent(MockLLMProvider(payload)).run(
+        "Recommend a movie", response_format=MovieRecommendation
+    )
+    assert validated.year == 2014
+
+    agent = Agent(MockLLMProvider("[1, 2]"), trusted_structured_output=True)
+    with pytest.raises(ValueError):
+        agent.run("Recommend a movie", response_format=MovieRecommendation)
+    print("✅ Trusted structured output skips validation.")
+
+
 if __name__ == "__main__":
     test_structured_output()
+    test_structured_output_parses_fenced_and_raw_json()
+    test_trusted_structured_output_skips_validation()
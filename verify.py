@@ -4,6 +4,7 @@ Verification script to check if the codebase is ready for CI/CD.
 Run this before pushing to GitHub.
 """
 
+import importlib.util
 import subprocess
 import sys
 
@@ -15,22 +16,31 @@ def run_command(cmd, description):
     print(f"Command: {' '.join(cmd)}")
     print(f"{'='*60}\n")
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    # Stream output as it is produced instead of buffering it until the command exits
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+    )
+    for line in proc.stdout:
+        print(line, end="", flush=True)
 
-    if result.returncode != 0:
-        print(f"❌ FAILED: {description}")
-        print("\nSTDOUT:")
-        print(result.stdout)
-        print("\nSTDERR:")
-        print(result.stderr)
+    if proc.wait() != 0:
+        print(f"\n❌ FAILED: {description}")
         return False
     else:
-        print(f"✅ PASSED: {description}")
-        if result.stdout:
-            print(result.stdout)
+        print(f"\n✅ PASSED: {description}")
         return True
 
 
+def pytest_command():
+    """Build the test command, spreading tests over all CPUs when pytest-xdist is installed"""
+    cmd = ["python", "-m", "pytest", "tests/", "-v"]
+    if importlib.util.find_spec("xdist") is not None:
+        # Tests wait on the network most of the time, so workers overlap those waits;
+        # loadgroup keeps tests marked with the same xdist_group on one worker
+        cmd += ["-n", "auto", "--dist", "loadgroup"]
+    return cmd
+
+
 def main():
     """Run all verification checks"""
     print("\n" + "🔍 "*20)
@@ -39,7 +49,7 @@ def main():
 
     checks = [
         (
-            ["python", "-m", "pytest", "tests/", "-v"],
+            pytest_command(),
             "Running tests",
         ),
         # Black check is disabled since we don't have black installed